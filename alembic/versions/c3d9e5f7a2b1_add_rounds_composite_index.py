@@ -0,0 +1,34 @@
+"""add rounds composite index
+
+Revision ID: c3d9e5f7a2b1
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d9e5f7a2b1'
+down_revision: Union[str, None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Composite index for current-round and completed-match lookups
+    op.create_index(
+        'ix_rounds_tid_rnum_done',
+        'rounds',
+        ['tournament_id', 'round_number', 'is_completed'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_rounds_tid_rnum_done', table_name='rounds')
@@ -1,8 +1,9 @@
 from datetime import date
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,6 +12,7 @@ from sqlalchemy.orm import selectinload
 from app.core.dependencies import (
     get_current_user,
     get_tournament_as_organizer,
+    get_tournament_context,
     get_tournament_for_user,
 )
 from app.db.base import get_db
@@ -36,6 +38,7 @@ from app.schemas.tournament import (
     TournamentUpdate,
 )
 from app.services.americano_service import AmericanoTournamentService
+from app.services.base_tournament_format import BaseTournamentFormat
 from app.services.tournament_result_service import TournamentResultService
 from app.services.tournament_service import TournamentService
 
@@ -671,47 +674,48 @@ async def record_match_result(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/{tournament_id}/leaderboard")
+@router.get("/{tournament_id}/leaderboard", response_class=ORJSONResponse)
 async def get_tournament_leaderboard(
-    tournament_id: str,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    tournament_context: Tuple[Tournament, BaseTournamentFormat] = Depends(get_tournament_context),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get tournament leaderboard with current scores."""
+    tournament, format_service = tournament_context
     tournament_service = TournamentService(db)
     
     try:
-        result = await db.execute(select(Tournament).filter(Tournament.id == tournament_id))
-        tournament = result.scalar_one_or_none()
-        if not tournament:
-            raise HTTPException(status_code=404, detail="Tournament not found")
-        
-        leaderboard_data = await tournament_service.get_tournament_leaderboard(tournament_id)
-        winner_data = await tournament_service.get_tournament_winner(tournament_id)
+        leaderboard_data = await tournament_service.get_tournament_leaderboard(
+            tournament.id, tournament, format_service
+        )
+        winner_data = await tournament_service.get_tournament_winner(
+            tournament.id, tournament, format_service
+        )
         
-        return {
-            "tournament_id": tournament_id,
+        # Entries are plain JSON-native dicts, so serialize directly with orjson
+        # instead of walking them again through jsonable_encoder
+        return ORJSONResponse({
+            "tournament_id": tournament.id,
             "tournament_name": tournament.name,
             "entries": leaderboard_data,
             "is_completed": tournament.status == TournamentStatus.COMPLETED.value,
             "winner": winner_data
-        }
+        })
         
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{tournament_id}/scores")
 async def get_player_scores(
-    tournament_id: str,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    tournament_context: Tuple[Tournament, BaseTournamentFormat] = Depends(get_tournament_context),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get current player scores for a tournament."""
+    tournament, format_service = tournament_context
     tournament_service = TournamentService(db)
     
     try:
-        scores = await tournament_service.get_player_scores(tournament_id)
-        return {"tournament_id": tournament_id, "scores": scores}
+        scores = await tournament_service.get_player_scores(tournament.id, tournament, format_service)
+        return {"tournament_id": tournament.id, "scores": scores}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -19,6 +19,11 @@ class DatabaseSettings(BaseModel):
     password: str = os.environ.get("DB_PASSWORD", "password")
     database: str = os.environ.get("DB_NAME", "padel_tournaments")
 
+    # Connection pool (one engine per process, shared by all requests)
+    pool_size: int = int(os.environ.get("DB_POOL_SIZE", "20"))
+    max_overflow: int = int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+    pool_recycle: int = int(os.environ.get("DB_POOL_RECYCLE", "1800"))
+
     @property
     def dsn(self) -> str:
         """Builds Postgres DSN."""
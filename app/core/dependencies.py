@@ -1,3 +1,5 @@
+from typing import Tuple
+
 from fastapi import Depends, HTTPException, status, Path
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -7,6 +9,8 @@ from app.core.auth import fastapi_users
 from app.models.user import User
 from app.models.tournament import Tournament
 from app.db.base import get_db
+from app.services.base_tournament_format import BaseTournamentFormat
+from app.services.tournament_service import TournamentService
 
 get_current_user = fastapi_users.current_user(active=True)
 get_current_superuser = fastapi_users.current_user(active=True, superuser=True)
@@ -69,3 +73,22 @@ async def get_tournament_for_user(
         )
     
     return tournament
+
+async def get_tournament_context(
+    tournament: Tournament = Depends(get_tournament_for_user),
+    db: AsyncSession = Depends(get_db)
+) -> Tuple[Tournament, BaseTournamentFormat]:
+    """
+    Dependency that loads the tournament (with players) and builds its format service
+    once per request, so downstream service calls can reuse both.
+    Raises 400 if the tournament system is not supported.
+    """
+    try:
+        format_service = TournamentService(db).get_format_service(tournament, list(tournament.players))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return tournament, format_service
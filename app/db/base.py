@@ -7,10 +7,14 @@ from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 
-# Create an async engine
+# Create the per-process async engine; reuse it everywhere instead of creating new ones
 engine = create_async_engine(
     settings.db.dsn,
     echo=False,
+    pool_pre_ping=True,
+    pool_size=settings.db.pool_size,
+    max_overflow=settings.db.max_overflow,
+    pool_recycle=settings.db.pool_recycle,
 )
 
 # Create async session factory
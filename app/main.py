@@ -14,16 +14,14 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.api import api_router
 from app.core.config import settings
-from app.db.session import configure_db, disconnect_from_db
-from sqlalchemy.ext.asyncio import AsyncEngine
+from app.db.base import engine
+from app.db.session import disconnect_from_db
 
 limiter = Limiter(key_func=get_remote_address)
 
 @asynccontextmanager
 async def lifespan(highlights_app: FastAPI):
     """Lifespan events."""
-    engine: AsyncEngine = await configure_db(settings.db.dsn, is_prod=False)
-
     logger.info(f"Starting {highlights_app.title}.")
 
     try:
@@ -1,11 +1,12 @@
-from sqlalchemy import Column, String, ForeignKey, Integer, Boolean
+from sqlalchemy import Column, String, ForeignKey, Integer, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.models.base import Base
+import uuid
 
 class Round(Base):
     __tablename__ = "rounds"
     
-    id = Column(String, primary_key=True)
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     tournament_id = Column(String, ForeignKey("tournaments.id"), nullable=False)
     round_number = Column(Integer, nullable=False, default=1)  # Added round number
     
@@ -33,5 +34,10 @@ class Round(Base):
     team2_player1 = relationship("User", foreign_keys=[team2_player1_id])
     team2_player2 = relationship("User", foreign_keys=[team2_player2_id])
 
+    # Covers the hot (tournament_id, round_number) and (tournament_id, is_completed) filters
+    __table_args__ = (
+        Index("ix_rounds_tid_rnum_done", "tournament_id", "round_number", "is_completed"),
+    )
+
     def __repr__(self):
         return f"<Round(id={self.id}, tournament_id={self.tournament_id}, round_number={self.round_number})>"
\ No newline at end of file
@@ -1,6 +1,6 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_
+from sqlalchemy import select, or_, func, case, union_all
 from sqlalchemy.orm import selectinload
 
 from app.repositories.base import BaseRepository
@@ -104,4 +104,59 @@ class RoundRepository(BaseRepository[Round]):
             )
             .order_by(Round.round_number)
         )
-        return result.scalars().all()
\ No newline at end of file
+        return result.scalars().all()
+    
+    async def get_player_statistics(self, tournament_id: str) -> Dict[str, Dict]:
+        """
+        Aggregate per-player statistics over completed rounds of a tournament in SQL.
+        Each match is unfolded into one row per player slot (points for/against) and
+        grouped by player, so only one row per player is transferred.
+        Players without completed matches are not included.
+        """
+        player_slots = [
+            (Round.team1_player1_id, Round.team1_score, Round.team2_score),
+            (Round.team1_player2_id, Round.team1_score, Round.team2_score),
+            (Round.team2_player1_id, Round.team2_score, Round.team1_score),
+            (Round.team2_player2_id, Round.team2_score, Round.team1_score),
+        ]
+        player_results = union_all(*[
+            select(
+                player_id.label("player_id"),
+                points_for.label("points_for"),
+                points_against.label("points_against")
+            )
+            .filter(
+                Round.tournament_id == tournament_id,
+                Round.is_completed == True
+            )
+            for player_id, points_for, points_against in player_slots
+        ]).cte("player_results")
+        
+        points_for = player_results.c.points_for
+        points_against = player_results.c.points_against
+        result = await self.db.execute(
+            select(
+                player_results.c.player_id,
+                func.sum(points_for).label("points_earned"),
+                func.sum(points_against).label("points_conceded"),
+                func.sum(case((points_for > points_against, 1), else_=0)).label("wins"),
+                func.sum(case((points_for < points_against, 1), else_=0)).label("losses"),
+                func.sum(case((points_for == points_against, 1), else_=0)).label("ties"),
+                func.count().label("matches_played")
+            )
+            .group_by(player_results.c.player_id)
+        )
+        
+        return {
+            row["player_id"]: {
+                'total_points': row["points_earned"],
+                'points_earned': row["points_earned"],
+                'points_conceded': row["points_conceded"],
+                'points_difference': row["points_earned"] - row["points_conceded"],
+                'wins': row["wins"],
+                'losses': row["losses"],
+                'ties': row["ties"],
+                'matches_played': row["matches_played"],
+            }
+            for row in result.mappings()
+        }
@@ -1,7 +1,91 @@
-from typing import List, Dict, Tuple, Optional
+import heapq
+from functools import lru_cache
+from operator import itemgetter
+from typing import Iterator, List, Dict, Tuple, Optional
 from app.services.base_tournament_format import BaseTournamentFormat
 from app.models.round import Round
 
+# A 1-factorization: (n-1) perfect matchings, each a tuple of (a, b) vertex pairs
+Factorization = Tuple[Tuple[Tuple[int, int], ...], ...]
+# A full schedule: one tuple of (a, b, c, d) ordinal matches per round
+Schedule = Tuple[Tuple[Tuple[int, int, int, int], ...], ...]
+
+
+def _compute_one_factorization(n: int) -> Factorization:
+    """
+    Generate a list of (n−1) perfect matchings (1‑factorization) for an even n.
+    Each perfect matching consists of n/2 unordered pairs of vertex indices.
+    """
+    # Round‑robin algorithm to generate a 1‑factorization
+    top = list(range(1, n))
+    rounds = []
+    for _ in range(n - 1):
+        arrangement = [0] + top
+        rounds.append(tuple((arrangement[i], arrangement[n - 1 - i]) for i in range(n // 2)))
+        # rotate the top list
+        top = [top[-1]] + top[:-1]
+    return tuple(rounds)
+
+
+# Deterministic, so precompute the common even player counts once at import
+_FACTORIZATION_CACHE: Dict[int, Factorization] = {
+    n: _compute_one_factorization(n) for n in range(4, 34, 2)
+}
+
+
+# Pairing patterns are memoized only up to this many edges (n <= 24 players, about 6 MB).
+# Their count grows like (m - 1)!!, so larger sizes are generated lazily on each call
+# rather than held for the life of the worker.
+_MAX_MEMOIZED_PATTERN_SIZE = 12
+
+
+@lru_cache(maxsize=None)
+def _pairing_index_patterns(size: int) -> Tuple[Tuple[Tuple[int, int], ...], ...]:
+    """
+    Enumerate all ways to pair up positions 0..size-1 into unordered pairs.
+    Only called for sizes up to _MAX_MEMOIZED_PATTERN_SIZE, so the cache stays small.
+    """
+    return tuple(_build_pairing_index_patterns(size))
+
+
+@lru_cache(maxsize=None)
+def _flat_pairing_patterns(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    The patterns of _pairing_index_patterns with each (i, j) flattened to i * size + j,
+    so scoring a pattern is a handful of list lookups into a size x size table.
+    """
+    return tuple(
+        tuple(i * size + j for i, j in pattern)
+        for pattern in _pairing_index_patterns(size)
+    )
+
+
+def _build_pairing_index_patterns(size: int) -> Iterator[Tuple[Tuple[int, int], ...]]:
+    """Generate the pairings of positions 0..size-1, reusing memoized patterns for small sizes."""
+    if size == 0:
+        yield ()
+        return
+    sub_patterns = (
+        _pairing_index_patterns if size - 2 <= _MAX_MEMOIZED_PATTERN_SIZE
+        else _build_pairing_index_patterns
+    )
+    for i in range(1, size):
+        # Pair position 0 with i, then pair the remaining positions recursively
+        remaining = [j for j in range(1, size) if j != i]
+        for sub in sub_patterns(size - 2):
+            yield ((0, i),) + tuple((remaining[a], remaining[b]) for a, b in sub)
+
+
+def _iter_pairing_patterns(size: int) -> Iterator[Tuple[Tuple[Tuple[int, int], ...], Tuple[int, ...]]]:
+    """Yield (pattern, flat pattern) pairs; memoized for small sizes, generated lazily above."""
+    if size <= _MAX_MEMOIZED_PATTERN_SIZE:
+        return zip(_pairing_index_patterns(size), _flat_pairing_patterns(size))
+    return (
+        (pattern, tuple(i * size + j for i, j in pattern))
+        for pattern in _build_pairing_index_patterns(size)
+    )
+
+
 class AmericanoTournamentService(BaseTournamentFormat):
     """
     Americano tournament format implementation.
@@ -16,7 +100,9 @@ class AmericanoTournamentService(BaseTournamentFormat):
 
     def validate_player_count(self) -> bool:
         """ Americano tournaments work with 4, 8, 12, 16, … players. """
-        return self.total_players >= 4 and self.total_players % 4 == 0
+        # total_players is counted once in __init__; a positive multiple of 4 has its low two bits clear
+        n = self.total_players
+        return n > 0 and not n & 3
 
     def generate_rounds(self) -> List[List[Tuple[str, str, str, str]]]:
         """
@@ -25,43 +111,33 @@ class AmericanoTournamentService(BaseTournamentFormat):
         This implementation ensures each pair of players partners exactly once and
         faces each other at least once.
         """
+        # The schedule is built on player ordinals 0..n-1 and depends only on n;
+        # ordinals are mapped back to player ids once, here at the boundary
+        schedule = self.generate_round_ordinals()
+        id_by_idx = [p.id for p in self.players]
+        return [
+            [(id_by_idx[a], id_by_idx[b], id_by_idx[c], id_by_idx[d]) for a, b, c, d in round_matches]
+            for round_matches in schedule
+        ]
+
+    def generate_round_ordinals(self) -> Schedule:
+        """
+        The generate_rounds schedule with players as ordinals, i.e. indices into
+        self.players.  The nested tuples are the shared cached schedule, so callers
+        that only inspect structure or coverage skip the id mapping entirely.
+        """
         if not self.validate_player_count():
             raise ValueError(
                 f"Invalid player count: {self.total_players}. Must be divisible by 4 and ≥4"
             )
-        n = self.total_players
-        player_ids = [p.id for p in self.players]
-
-        # Compute one‑factorization of the complete graph on n vertices.
-        # This partitions all possible pairs into n−1 perfect matchings,
-        # giving the number of rounds needed.
-        factorization = self._one_factorization(n)
-
-        # Use a greedy pairing algorithm to convert each perfect matching into
-        # matches of four players (two pairs) while maximising new opponent pairs.
-        rounds = self._generate_balanced_americano_rounds(player_ids, factorization)
-        return rounds
+        return _generate_rounds_cached(self.total_players)
 
     @staticmethod
-    def _one_factorization(n: int) -> List[List[Tuple[int, int]]]:
+    def _one_factorization(n: int) -> Factorization:
         """
-        Generate a list of (n−1) perfect matchings (1‑factorization) for an even n.
-        Each perfect matching consists of n/2 unordered pairs of vertex indices.
+        Return the 1‑factorization for an even n, from the precomputed table when possible.
         """
-        # Round‑robin algorithm to generate a 1‑factorization
-        top = list(range(1, n))
-        rounds = []
-        for _ in range(n - 1):
-            pairs = []
-            arrangement = [0] + top
-            for i in range(n // 2):
-                a = arrangement[i]
-                b = arrangement[n - 1 - i]
-                pairs.append((a, b))
-            rounds.append(pairs)
-            # rotate the top list
-            top = [top[-1]] + top[:-1]
-        return rounds
+        return _FACTORIZATION_CACHE.get(n) or _compute_one_factorization(n)
 
     @staticmethod
     def _pairings_of_edges(edges: List[Tuple[int, int]]) -> List[List[Tuple[Tuple[int, int], Tuple[int, int]]]]:
@@ -69,68 +145,64 @@ class AmericanoTournamentService(BaseTournamentFormat):
         Enumerate all ways to pair up the list of edges into unordered pairs.
         Used to split a perfect matching (n/2 edges) into n/4 matches.
         """
-        if not edges:
-            return [[]]
-        first = edges[0]
-        rest = edges[1:]
-        result = []
-        for i, e in enumerate(rest):
-            pair = (first, e)
-            remaining = rest[:i] + rest[i + 1:]
-            for sub in AmericanoTournamentService._pairings_of_edges(remaining):
-                result.append([pair] + sub)
-        return result
+        return [
+            [(edges[i], edges[j]) for i, j in pattern]
+            for pattern, _ in _iter_pairing_patterns(len(edges))
+        ]
 
+    @staticmethod
     def _generate_balanced_americano_rounds(
-        self, player_ids: List[str], factorization: List[List[Tuple[int, int]]]
-    ) -> List[List[Tuple[str, str, str, str]]]:
+        n: int, factorization: Factorization
+    ) -> List[List[Tuple[int, int, int, int]]]:
         """
         Given a 1‑factorization, greedily pair edges in each round to maximise new
         opponent pairs.  Returns a list of rounds, where each round is a list of
-        matches represented as (playerA, playerB, playerC, playerD).
+        matches represented as player ordinals (a, b, c, d).
         """
-        n = len(player_ids)
         cross_covered = set()  # track opponent pairs already used
-        rounds: List[List[Tuple[str, str, str, str]]] = []
+        total_cross = n * (n - 1) // 2
+        rounds: List[List[Tuple[int, int, int, int]]] = []
 
         for round_pairs in factorization:
-            # enumerate all ways to pair the n/2 edges into n/4 matches
-            pairings = self._pairings_of_edges(round_pairs)
-            best_pairing = None
-            max_new_cross = -1
+            # New opponent pairs each pair of edges (i < j) would introduce; a pairing's
+            # score is the sum of its entries, so every edge pair is evaluated only once
+            m = len(round_pairs)
+            gain = [0] * (m * m)
+            for i, (a, b) in enumerate(round_pairs):
+                for j in range(i + 1, m):
+                    c, d = round_pairs[j]
+                    gain[i * m + j] = sum(
+                        (min(u, v), max(u, v)) not in cross_covered
+                        for u in (a, b)
+                        for v in (c, d)
+                    )
 
-            # choose the pairing that introduces the most new opponent pairs
-            for pairing in pairings:
-                new_cross = 0
-                for (a, b), (c, d) in pairing:
-                    for u in (a, b):
-                        for v in (c, d):
-                            cp = (min(u, v), max(u, v))
-                            if cp not in cross_covered:
-                                new_cross += 1
+            # choose the pairing of the n/2 edges into n/4 matches that introduces
+            # the most new opponent pairs
+            remaining_cross = total_cross - len(cross_covered)
+            best_pattern = None
+            max_new_cross = -1
+            for pattern, flat in _iter_pairing_patterns(m):
+                new_cross = sum(map(gain.__getitem__, flat))
                 if new_cross > max_new_cross:
                     max_new_cross = new_cross
-                    best_pairing = pairing
+                    best_pattern = pattern
                     # early exit if this pairing covers all remaining cross pairs
-                    if max_new_cross == (n * (n - 1) // 2) - len(cross_covered):
+                    if max_new_cross == remaining_cross:
                         break
 
             # record opponent pairs and build matches for this round
-            round_matches: List[Tuple[str, str, str, str]] = []
-            for (a, b), (c, d) in best_pairing:
+            round_matches: List[Tuple[int, int, int, int]] = []
+            for i, j in best_pattern:
+                (a, b), (c, d) = round_pairs[i], round_pairs[j]
                 # update opponent coverage
                 for u in (a, b):
                     for v in (c, d):
                         cross_covered.add((min(u, v), max(u, v)))
-                # convert indices to player IDs and record match
-                round_matches.append((player_ids[a], player_ids[b], player_ids[c], player_ids[d]))
+                round_matches.append((a, b, c, d))
             rounds.append(round_matches)
         return rounds
 
-    def _calculate_optimal_rounds(self) -> int:
-        """Each player partners with every other player once, so need (P − 1) rounds."""
-        return max(self.total_players - 1, 3)
-
     @staticmethod
     def calculate_total_rounds(num_players: int) -> int:
         return num_players - 1
@@ -187,67 +259,101 @@ class AmericanoTournamentService(BaseTournamentFormat):
         """Compute individual scores for players based on completed matches."""
         player_scores = {p.id: 0 for p in self.players}
         for round_match in completed_rounds:
-            if round_match.is_completed:
-                player_scores[round_match.team1_player1_id] += round_match.team1_score
-                player_scores[round_match.team1_player2_id] += round_match.team1_score
-                player_scores[round_match.team2_player1_id] += round_match.team2_score
-                player_scores[round_match.team2_player2_id] += round_match.team2_score
+            if not round_match.is_completed:
+                continue
+            # Read each team score once per match instead of once per player
+            team1_score = round_match.team1_score
+            team2_score = round_match.team2_score
+            player_scores[round_match.team1_player1_id] += team1_score
+            player_scores[round_match.team1_player2_id] += team1_score
+            player_scores[round_match.team2_player1_id] += team2_score
+            player_scores[round_match.team2_player2_id] += team2_score
         return player_scores
 
     def calculate_player_statistics(self, completed_rounds: List[Round]) -> Dict[str, Dict]:
         """Calculate comprehensive player statistics including W‑L‑T records."""
-        player_stats = {
-            p.id: {
-                'total_points': 0,
-                'points_earned': 0,
-                'points_conceded': 0,
-                'points_difference': 0,
-                'wins': 0,
-                'losses': 0,
-                'ties': 0,
-                'matches_played': 0,
+        # Structure of arrays: one flat counter list per statistic, indexed by player ordinal
+        index = {p.id: i for i, p in enumerate(self.players)}
+        size = len(self.players)
+        earned = [0] * size
+        conceded = [0] * size
+        wins = [0] * size
+        losses = [0] * size
+        ties = [0] * size
+        played = [0] * size
+
+        for round_match in completed_rounds:
+            if not round_match.is_completed:
+                continue
+            t1, t2 = round_match.team1_score, round_match.team2_score
+            team1 = (index[round_match.team1_player1_id], index[round_match.team1_player2_id])
+            team2 = (index[round_match.team2_player1_id], index[round_match.team2_player2_id])
+            for i in team1:
+                earned[i] += t1
+                conceded[i] += t2
+                played[i] += 1
+            for i in team2:
+                earned[i] += t2
+                conceded[i] += t1
+                played[i] += 1
+            if t1 == t2:
+                for i in team1 + team2:
+                    ties[i] += 1
+            else:
+                winners, losers = (team1, team2) if t1 > t2 else (team2, team1)
+                for i in winners:
+                    wins[i] += 1
+                for i in losers:
+                    losses[i] += 1
+
+        # Materialize per-player dicts only at the return boundary
+        return {
+            player_id: {
+                'total_points': earned[i],
+                'points_earned': earned[i],
+                'points_conceded': conceded[i],
+                'points_difference': earned[i] - conceded[i],
+                'wins': wins[i],
+                'losses': losses[i],
+                'ties': ties[i],
+                'matches_played': played[i],
             }
-            for p in self.players
+            for player_id, i in index.items()
         }
-        for round_match in completed_rounds:
-            if round_match.is_completed:
-                t1, t2 = round_match.team1_score, round_match.team2_score
-                if t1 > t2:
-                    res1, res2 = 'win', 'loss'
-                elif t2 > t1:
-                    res1, res2 = 'loss', 'win'
-                else:
-                    res1 = res2 = 'tie'
-                for pid in [round_match.team1_player1_id, round_match.team1_player2_id]:
-                    stats = player_stats[pid]
-                    stats['total_points'] += t1
-                    stats['points_earned'] += t1
-                    stats['points_conceded'] += t2
-                    stats['points_difference'] += (t1 - t2)
-                    stats['matches_played'] += 1
-                    stats['wins'] += res1 == 'win'
-                    stats['losses'] += res1 == 'loss'
-                    stats['ties'] += res1 == 'tie'
-                for pid in [round_match.team2_player1_id, round_match.team2_player2_id]:
-                    stats = player_stats[pid]
-                    stats['total_points'] += t2
-                    stats['points_earned'] += t2
-                    stats['points_conceded'] += t1
-                    stats['points_difference'] += (t2 - t1)
-                    stats['matches_played'] += 1
-                    stats['wins'] += res2 == 'win'
-                    stats['losses'] += res2 == 'loss'
-                    stats['ties'] += res2 == 'tie'
-        return player_stats
 
     def get_total_rounds(self) -> int:
-        return self._calculate_optimal_rounds()
+        """Each player partners with every other player once, so need (P − 1) rounds."""
+        return self.total_players - 1
 
     def is_tournament_complete(self, current_round: int) -> bool:
-        return current_round > self.get_total_rounds()
+        # Same bound as get_total_rounds, inlined to skip the method hop
+        return current_round > self.total_players - 1
 
     def get_tournament_winner(self, player_scores: Dict[str, int]) -> Optional[str]:
-        return max(player_scores, key=player_scores.get) if player_scores else None
+        # Single pass over (id, score) pairs; avoids a dict lookup per key
+        return max(player_scores.items(), key=itemgetter(1))[0] if player_scores else None
+
+    def get_player_leaderboard(
+        self, player_scores: Dict[str, int], k: Optional[int] = None
+    ) -> List[Tuple[str, int]]:
+        """Players ordered by score; with k, only the top k are selected using a bounded heap."""
+        if k is None:
+            return sorted(player_scores.items(), key=itemgetter(1), reverse=True)
+        return heapq.nlargest(k, player_scores.items(), key=itemgetter(1))
+
+
+@lru_cache(maxsize=128)
+def _generate_rounds_cached(n: int) -> Schedule:
+    """
+    Build the Americano schedule for n players as ordinals 0..n-1.
+    The result is immutable so cached schedules can be shared safely.
+    """
+    # Compute one‑factorization of the complete graph on n vertices.
+    # This partitions all possible pairs into n−1 perfect matchings,
+    # giving the number of rounds needed.
+    factorization = AmericanoTournamentService._one_factorization(n)
 
-    def get_player_leaderboard(self, player_scores: Dict[str, int]) -> List[Tuple[str, int]]:
-        return sorted(player_scores.items(), key=lambda x: x[1], reverse=True)
\ No newline at end of file
+    # Use a greedy pairing algorithm to convert each perfect matching into
+    # matches of four players (two pairs) while maximising new opponent pairs.
+    rounds = AmericanoTournamentService._generate_balanced_americano_rounds(n, factorization)
+    return tuple(tuple(round_matches) for round_matches in rounds)
@@ -1,14 +1,16 @@
+from operator import itemgetter
 from typing import List, Dict, Optional, Type
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, exists, insert, and_
 from sqlalchemy.orm import selectinload
-from app.models.tournament import Tournament, TournamentSystem, TournamentStatus
+from app.models.tournament import Tournament, TournamentSystem, TournamentStatus, tournament_player
 from app.models.round import Round
+from app.models.tournament_result import TournamentResult
 from app.models.user import User
+from app.repositories.round_repository import RoundRepository
 from app.services.base_tournament_format import BaseTournamentFormat
 from app.services.americano_service import AmericanoTournamentService
 from app.services.elo_service import ELOService
-import uuid
 
 class TournamentService:
     """
@@ -22,6 +24,10 @@ class TournamentService:
         # TournamentSystem.MEXICANO: MexicanoTournamentService,  # To be implemented later
     }
     
+    # Systems whose leaderboard statistics RoundRepository.get_player_statistics aggregates
+    # in SQL; it must agree with the format service's calculate_player_statistics
+    SQL_STATISTICS_SYSTEMS = frozenset({TournamentSystem.AMERICANO})
+    
     def __init__(self, db: AsyncSession):
         self.db = db
     
@@ -47,9 +53,7 @@ class TournamentService:
         Start a tournament by generating all rounds and setting status to active.
         """
         result = await self.db.execute(
-            select(Tournament)
-            .options(selectinload(Tournament.players))
-            .filter(Tournament.id == tournament_id)
+            select(Tournament).filter(Tournament.id == tournament_id)
         )
         tournament = result.scalar_one_or_none()
         if not tournament:
@@ -58,29 +62,32 @@ class TournamentService:
         if tournament.status != TournamentStatus.PENDING.value:
             raise ValueError(f"Tournament {tournament_id} cannot be started. Current status: {tournament.status}")
         
+        # Round generation only needs player ids, so skip loading full user rows
+        players = await self._get_player_stubs(tournament.id)
+        
         # Validate tournament setup
-        if not self.validate_tournament_setup(tournament, list(tournament.players)):
+        if not self.validate_tournament_setup(tournament, players):
             raise ValueError("Tournament setup is invalid for the selected format")
         
         # Get format service and generate rounds
-        format_service = self.get_format_service(tournament, list(tournament.players))
+        format_service = self.get_format_service(tournament, players)
         rounds_data = format_service.generate_rounds()
         
-        # Create Round objects in database
-        created_rounds = []
-        for round_number, round_matches in enumerate(rounds_data, 1):
-            for match in round_matches:
-                round_obj = Round(
-                    id=str(uuid.uuid4()),
-                    tournament_id=tournament.id,
-                    round_number=round_number,
-                    team1_player1_id=match[0],
-                    team1_player2_id=match[1],
-                    team2_player1_id=match[2],
-                    team2_player2_id=match[3]
-                )
-                self.db.add(round_obj)
-                created_rounds.append(round_obj)
+        # Bulk insert all rounds in a single statement; ids come from the column default
+        round_rows = [
+            {
+                "tournament_id": tournament.id,
+                "round_number": round_number,
+                "team1_player1_id": match[0],
+                "team1_player2_id": match[1],
+                "team2_player1_id": match[2],
+                "team2_player2_id": match[3],
+            }
+            for round_number, round_matches in enumerate(rounds_data, 1)
+            for match in round_matches
+        ]
+        if round_rows:
+            await self.db.execute(insert(Round), round_rows)
         
         # Update tournament status
         tournament.status = TournamentStatus.ACTIVE.value
@@ -95,21 +102,24 @@ class TournamentService:
         """
         Get all matches for the current round of a tournament.
         """
+        # Single round-trip: outer join keeps the tournament row even when the
+        # current round has no matches, so a missing tournament is still detectable
         result = await self.db.execute(
-            select(Tournament)
-            .options(selectinload(Tournament.players))
+            select(Tournament.id, Round)
+            .outerjoin(
+                Round,
+                and_(
+                    Round.tournament_id == Tournament.id,
+                    Round.round_number == Tournament.current_round
+                )
+            )
             .filter(Tournament.id == tournament_id)
         )
-        tournament = result.scalar_one_or_none()
-        if not tournament:
+        rows = result.all()
+        if not rows:
             raise ValueError(f"Tournament {tournament_id} not found")
         
-        result = await self.db.execute(
-            select(Round)
-            .filter(Round.tournament_id == tournament_id)
-            .filter(Round.round_number == tournament.current_round)
-        )
-        return result.scalars().all()
+        return [match for _, match in rows if match is not None]
     
     async def record_match_result(self, match_id: str, team1_score: int, team2_score: int) -> Round:
         """
@@ -123,7 +133,6 @@ class TournamentService:
         # Get tournament to validate points_per_match
         tournament_result = await self.db.execute(
             select(Tournament)
-            .options(selectinload(Tournament.players))
             .filter(Tournament.id == match.tournament_id)
         )
         tournament = tournament_result.scalar_one_or_none()
@@ -175,25 +184,27 @@ class TournamentService:
         Check if all matches in current round are completed and advance to next round.
         """
         result = await self.db.execute(
-            select(Tournament)
-            .options(selectinload(Tournament.players))
-            .filter(Tournament.id == tournament_id)
+            select(Tournament).filter(Tournament.id == tournament_id)
         )
         tournament = result.scalar_one_or_none()
         if not tournament:
             return
         
-        # Check if all matches in current round are completed
-        result = await self.db.execute(
-            select(Round)
-            .filter(Round.tournament_id == tournament_id)
-            .filter(Round.round_number == tournament.current_round)
+        # Check if any match in current round is still incomplete
+        has_incomplete_matches = await self.db.scalar(
+            select(
+                exists()
+                .where(Round.tournament_id == tournament_id)
+                .where(Round.round_number == tournament.current_round)
+                .where(Round.is_completed.is_not(True))
+            )
         )
-        current_round_matches = result.scalars().all()
         
-        if all(match.is_completed for match in current_round_matches):
-            # All matches in current round completed
-            format_service = self.get_format_service(tournament, list(tournament.players))
+        if not has_incomplete_matches:
+            # All matches in current round completed; the completion check only
+            # depends on the player count, so load ids only
+            players = await self._get_player_stubs(tournament_id)
+            format_service = self.get_format_service(tournament, players)
             
             # Check if tournament is complete - advance to next round if not the last round
             if not format_service.is_tournament_complete(tournament.current_round + 1):
@@ -202,36 +213,24 @@ class TournamentService:
             
             await self.db.commit()
     
-    async def get_player_scores(self, tournament_id: str, tournament: Tournament = None) -> Dict[str, int]:
+    async def _get_player_stubs(self, tournament_id: str) -> List[User]:
         """
-        Get current player scores for a tournament.
-        If tournament object is already available, pass it to avoid duplicate database queries.
+        Load a tournament's player ids from the association table as id-only users.
+        The users are transient and never added to the session, so no attribute
+        access on them can trigger a lazy load; format services only read .id.
         """
-        if tournament is None:
-            result = await self.db.execute(
-                select(Tournament)
-                .options(selectinload(Tournament.players))
-                .filter(Tournament.id == tournament_id)
-            )
-            tournament = result.scalar_one_or_none()
-            if not tournament:
-                raise ValueError(f"Tournament {tournament_id} not found")
-        
-        # Get all completed rounds
         result = await self.db.execute(
-            select(Round)
-            .filter(Round.tournament_id == tournament_id)
-            .filter(Round.is_completed == True)
+            select(tournament_player.c.player_id)
+            .where(tournament_player.c.tournament_id == tournament_id)
         )
-        completed_rounds = result.scalars().all()
-        
-        # Calculate scores using format service
-        format_service = self.get_format_service(tournament, list(tournament.players))
-        return format_service.calculate_player_scores(completed_rounds)
+        return [User(id=player_id) for player_id in result.scalars().all()]
     
-    async def get_tournament_leaderboard(self, tournament_id: str) -> List[Dict]:
+    async def _get_tournament_with_players(self, tournament_id: str) -> Tournament:
         """
-        Get tournament leaderboard with player details and comprehensive statistics.
+        Load a tournament with its players eager-loaded, raising if it doesn't exist.
+        The score, leaderboard and winner methods only call this when no tournament is
+        passed in; callers that already hold the tournament (and its format service)
+        pass them to skip this query and the format service construction.
         """
         result = await self.db.execute(
             select(Tournament)
@@ -241,8 +240,21 @@ class TournamentService:
         tournament = result.scalar_one_or_none()
         if not tournament:
             raise ValueError(f"Tournament {tournament_id} not found")
+        return tournament
+    
+    async def get_player_scores(
+        self,
+        tournament_id: str,
+        tournament: Tournament = None,
+        format_service: Optional[BaseTournamentFormat] = None
+    ) -> Dict[str, int]:
+        """
+        Get current player scores for a tournament.
+        """
+        if tournament is None:
+            tournament = await self._get_tournament_with_players(tournament_id)
         
-        # Get all completed rounds for statistics calculation
+        # Get all completed rounds
         result = await self.db.execute(
             select(Round)
             .filter(Round.tournament_id == tournament_id)
@@ -250,14 +262,45 @@ class TournamentService:
         )
         completed_rounds = result.scalars().all()
         
-        format_service = self.get_format_service(tournament, list(tournament.players))
+        # Calculate scores using format service
+        if format_service is None:
+            format_service = self.get_format_service(tournament, list(tournament.players))
+        return format_service.calculate_player_scores(completed_rounds)
+    
+    async def get_tournament_leaderboard(
+        self,
+        tournament_id: str,
+        tournament: Tournament = None,
+        format_service: Optional[BaseTournamentFormat] = None
+    ) -> List[Dict]:
+        """
+        Get tournament leaderboard with player details and comprehensive statistics.
+        """
+        if tournament is None:
+            tournament = await self._get_tournament_with_players(tournament_id)
+        
+        if format_service is None:
+            format_service = self.get_format_service(tournament, list(tournament.players))
         
-        # Get comprehensive player statistics if available
-        if hasattr(format_service, 'calculate_player_statistics'):
-            player_stats = format_service.calculate_player_statistics(completed_rounds)
+        # Get comprehensive player statistics if the system supports it (aggregated in the database)
+        if tournament.system in self.SQL_STATISTICS_SYSTEMS:
+            aggregated_stats = await RoundRepository(self.db).get_player_statistics(tournament_id)
+            player_stats = {
+                player.id: aggregated_stats.get(player.id) or {
+                    'total_points': 0,
+                    'points_earned': 0,
+                    'points_conceded': 0,
+                    'points_difference': 0,
+                    'wins': 0,
+                    'losses': 0,
+                    'ties': 0,
+                    'matches_played': 0,
+                }
+                for player in tournament.players
+            }
         else:
             # Fallback to basic scores
-            player_scores = await self.get_player_scores(tournament_id, tournament)
+            player_scores = await self.get_player_scores(tournament_id, tournament, format_service)
             player_stats = {
                 pid: {
                     'total_points': score,
@@ -269,20 +312,22 @@ class TournamentService:
                 } for pid, score in player_scores.items()
             }
         
-        # Sort by total points (descending), then by points difference (descending)
+        # Sort by total points (descending), then by points difference (descending).
+        # Sort keys are packed once per player and compared via a C-level itemgetter.
         leaderboard = sorted(
-            player_stats.items(), 
-            key=lambda x: (x[1]['total_points'], x[1]['points_difference']), 
+            [
+                (stats['total_points'], stats['points_difference'], player_id, stats)
+                for player_id, stats in player_stats.items()
+            ],
+            key=itemgetter(0, 1),
             reverse=True
         )
         
-        # Enrich with player details - bulk load all users
-        player_ids = [player_id for player_id, _ in leaderboard]
-        result = await self.db.execute(select(User).filter(User.id.in_(player_ids)))
-        users_dict = {user.id: user for user in result.scalars().all()}
+        # Enrich with player details - players are already eager-loaded with the tournament
+        users_dict = {user.id: user for user in tournament.players}
         
         result_list = []
-        for player_id, stats in leaderboard:
+        for _, _, player_id, stats in leaderboard:
             player = users_dict.get(player_id)
             if player:
                 result_list.append({
@@ -300,24 +345,43 @@ class TournamentService:
         
         return result_list
     
-    async def get_tournament_winner(self, tournament_id: str) -> Optional[Dict]:
+    async def get_tournament_winner(
+        self,
+        tournament_id: str,
+        tournament: Tournament = None,
+        format_service: Optional[BaseTournamentFormat] = None
+    ) -> Optional[Dict]:
         """
         Get the tournament winner (only if tournament is completed).
         """
-        result = await self.db.execute(
-            select(Tournament)
-            .options(selectinload(Tournament.players))
-            .filter(Tournament.id == tournament_id)
-        )
-        tournament = result.scalar_one_or_none()
-        if not tournament:
-            raise ValueError(f"Tournament {tournament_id} not found")
+        if tournament is None:
+            tournament = await self._get_tournament_with_players(tournament_id)
         
         if tournament.status != TournamentStatus.COMPLETED.value:
             return None
         
-        player_scores = await self.get_player_scores(tournament_id, tournament)
-        format_service = self.get_format_service(tournament, list(tournament.players))
+        # Final results are stored when the tournament is finished and never change,
+        # so read the winner directly instead of recomputing scores
+        result = await self.db.execute(
+            select(TournamentResult, User)
+            .join(User, User.id == TournamentResult.player_id)
+            .filter(TournamentResult.tournament_id == tournament_id)
+            .filter(TournamentResult.final_position == 1)
+        )
+        stored_winner = result.first()
+        if stored_winner:
+            winner_result, winner = stored_winner
+            return {
+                "player_id": winner.id,
+                "player_name": winner.full_name or winner.email or "Unknown Player",
+                "email": winner.email,
+                "score": winner_result.total_score
+            }
+        
+        # Fallback for tournaments finished without stored results
+        if format_service is None:
+            format_service = self.get_format_service(tournament, list(tournament.players))
+        player_scores = await self.get_player_scores(tournament_id, tournament, format_service)
         winner_id = format_service.get_tournament_winner(player_scores)
         
         if winner_id:
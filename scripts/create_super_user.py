@@ -11,13 +11,12 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi_users.password import PasswordHelper
 from dotenv import load_dotenv
 
 from app.models.user import User
-from app.core.config import settings
+from app.db.base import engine
 
 load_dotenv()
 
@@ -40,12 +39,9 @@ async def create_first_superuser():
         
     full_name = input("Enter full name (optional): ").strip() or None
     
-    # Create async engine
-    engine = create_async_engine(settings.db.dsn, echo=False)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    
+    # Reuse the shared app engine: a single connection and transaction for the whole flow
     try:
-        async with async_session() as session:
+        async with engine.begin() as conn, AsyncSession(bind=conn, expire_on_commit=False) as session:
             # Check if user already exists
             from sqlalchemy import select
             result = await session.execute(select(User).filter(User.email == email))
@@ -4,11 +4,22 @@ Visualize Alembic migration hierarchy by parsing revision files.
 Shows the dependency tree of migrations based on revision and down_revision fields.
 """
 
+import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 
+# Compiled once at import (bytes patterns); handle both with and without type annotations
+_REVISION_RE = re.compile(rb"revision(?:\s*:\s*str)?\s*=\s*['\"]([^'\"]+)['\"]")
+_DOWN_REVISION_RE = re.compile(rb"down_revision(?:\s*:\s*Union\[str,\s*None\])?\s*=\s*['\"]([^'\"]+)['\"]")
+_DOWN_REVISION_NONE_RE = re.compile(rb"down_revision(?:\s*:\s*Union\[str,\s*None\])?\s*=\s*None")
+
+# Parsed results keyed by filename, invalidated by (mtime_ns, size)
+_PARSE_CACHE_FILENAME = ".parse-cache.json"
+
 
 def parse_migration_file(filepath: Path) -> Tuple[Optional[str], Optional[str], str]:
     """
@@ -16,93 +27,192 @@ def parse_migration_file(filepath: Path) -> Tuple[Optional[str], Optional[str],
     
     Returns: (revision, down_revision, description)
     """
-    with open(filepath, 'r') as f:
-        content = f.read()
+    content = filepath.read_bytes()
+    
+    # Extract description from filename
+    filename = filepath.stem
+    parts = filename.split('_', 1)
+    description = parts[1] if len(parts) > 1 else filename
     
-    # Handle both with and without type annotations
-    revision_match = re.search(r"revision(?:\s*:\s*str)?\s*=\s*['\"]([^'\"]+)['\"]", content)
-    down_revision_match = re.search(r"down_revision(?:\s*:\s*Union\[str,\s*None\])?\s*=\s*['\"]([^'\"]+)['\"]", content)
+    # Cheap substring test before running any regex
+    if b'revision' not in content:
+        return None, None, description
     
-    revision = revision_match.group(1) if revision_match else None
-    down_revision = down_revision_match.group(1) if down_revision_match else None
+    revision_match = _REVISION_RE.search(content)
+    down_revision_match = _DOWN_REVISION_RE.search(content)
+    
+    revision = revision_match.group(1).decode('ascii') if revision_match else None
+    down_revision = down_revision_match.group(1).decode('ascii') if down_revision_match else None
     
     # Handle None values for down_revision (initial migration)
     if not down_revision_match:
-        down_revision_none = re.search(r"down_revision(?:\s*:\s*Union\[str,\s*None\])?\s*=\s*None", content)
+        down_revision_none = _DOWN_REVISION_NONE_RE.search(content)
         if down_revision_none:
             down_revision = None
     
-    # Extract description from filename
-    filename = filepath.stem
-    parts = filename.split('_', 1)
-    description = parts[1] if len(parts) > 1 else filename
-    
     return revision, down_revision, description
 
 
-def build_migration_tree(versions_dir: Path) -> Dict[Optional[str], List[Tuple[str, str]]]:
+def _load_parse_cache(cache_path: Path) -> Dict[str, list]:
+    """Load the parse cache, treating a missing or corrupt file as empty."""
+    try:
+        cache = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _write_parse_cache(cache_path: Path, cache: Dict[str, list]):
+    """Atomically replace the parse cache; failures only cost the next run a re-parse."""
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        tmp_path.write_text(json.dumps(cache, sort_keys=True))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def _parse_with_cache(filepath: Path, cache: Dict[str, list]) -> Tuple[str, list]:
+    """
+    Parse a migration file unless the cache holds an entry with the same mtime and size.
+    
+    Returns: (filename, [mtime_ns, size, revision, down_revision, description])
+    """
+    stat = filepath.stat()
+    entry = cache.get(filepath.name)
+    if entry and entry[:2] == [stat.st_mtime_ns, stat.st_size]:
+        return filepath.name, entry
+    return filepath.name, [stat.st_mtime_ns, stat.st_size, *parse_migration_file(filepath)]
+
+
+def build_migration_tree(versions_dir: Path) -> Tuple[Dict, Dict, Set[str], Set[str]]:
     """
     Build a tree structure of migrations.
     
-    Returns: Dictionary mapping parent revision to list of (child_revision, description) tuples
+    Returns: (tree, revisions, parents, leaves) where tree maps parent revision to list of
+    (child_revision, description) tuples, parents holds every referenced down_revision
+    and leaves holds the head revisions
     """
     tree = {}
     revisions = {}
+    parents: Set[str] = set()
+    
+    cache_path = versions_dir / _PARSE_CACHE_FILENAME
+    cache = _load_parse_cache(cache_path)
+    
+    # Parse all migration files concurrently; the cache is only read by workers.
+    # Underscore-prefixed names (__init__.py, __pycache__) are not migrations
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        new_cache = dict(executor.map(
+            lambda filepath: _parse_with_cache(filepath, cache),
+            versions_dir.glob("[!_]*.py"),
+        ))
+    
+    if new_cache != cache:
+        _write_parse_cache(cache_path, new_cache)
     
-    # Parse all migration files
-    for filepath in versions_dir.glob("*.py"):
-        if filepath.stem == "__pycache__":
+    # Build revisions, tree structure and referenced parents in one pass
+    for _, _, revision, down_revision, description in new_cache.values():
+        if not revision or revision in revisions:
             continue
-            
-        revision, down_revision, description = parse_migration_file(filepath)
-        if revision:
-            revisions[revision] = (down_revision, description)
+        revisions[revision] = (down_revision, description)
+        tree.setdefault(down_revision, []).append((revision, description))
+        if down_revision:
+            parents.add(down_revision)
+    
+    # Sort children once so every traversal can use them as-is
+    for children in tree.values():
+        children.sort(key=itemgetter(0))
     
-    # Build tree structure
-    for revision, (down_revision, description) in revisions.items():
-        if down_revision not in tree:
-            tree[down_revision] = []
-        tree[down_revision].append((revision, description))
+    # Revisions without children are the heads
+    leaves = set(revisions) - parents
     
-    return tree, revisions
+    return tree, revisions, parents, leaves
 
 
-def find_heads(tree: Dict, revisions: Dict) -> List[str]:
-    """Find all head revisions (revisions with no children)."""
-    all_revisions = set(revisions.keys())
-    parent_revisions = set()
+def find_cycles(tree: Dict, revisions: Dict) -> List[List[str]]:
+    """
+    Find dependency cycles using Tarjan's strongly connected components algorithm.
     
-    for children in tree.values():
-        for child, _ in children:
-            if child in revisions:
-                parent_revision = revisions[child][0]
-                if parent_revision:
-                    parent_revisions.add(parent_revision)
+    Edges run from down_revision to revision. Returns: list of cycles (lists of revisions)
+    """
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    scc_stack: List[str] = []
+    cycles: List[List[str]] = []
     
-    heads = all_revisions - parent_revisions
-    return list(heads)
+    for start in revisions:
+        if start in index:
+            continue
+        
+        index[start] = lowlink[start] = len(index)
+        scc_stack.append(start)
+        on_stack.add(start)
+        # Explicit work stack of (revision, iterator over its children)
+        work = [(start, iter(tree.get(start, ())))]
+        
+        while work:
+            revision, children = work[-1]
+            for child_rev, _ in children:
+                if child_rev not in index:
+                    index[child_rev] = lowlink[child_rev] = len(index)
+                    scc_stack.append(child_rev)
+                    on_stack.add(child_rev)
+                    work.append((child_rev, iter(tree.get(child_rev, ()))))
+                    break
+                if child_rev in on_stack:
+                    lowlink[revision] = min(lowlink[revision], index[child_rev])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[revision])
+                
+                if lowlink[revision] == index[revision]:
+                    component = []
+                    while True:
+                        member = scc_stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == revision:
+                            break
+                    
+                    is_self_loop = revisions[revision][0] == revision
+                    if len(component) > 1 or is_self_loop:
+                        cycles.append(component[::-1])
+    
+    return cycles
 
 
-def print_tree(tree: Dict, revisions: Dict, revision: Optional[str] = None, 
-               indent: int = 0, printed: Set[str] = None, is_last: bool = True,
-               prefix: str = ""):
+def print_tree(tree: Dict, revisions: Dict, leaves: Set[str], root: Optional[str] = None):
     """
-    Recursively print the migration tree.
+    Print the migration tree below root using an iterative depth-first walk.
+    
+    Each revision has a single parent, so a walk from a root never enters a cycle;
+    cycles are reported separately by find_cycles.
     """
-    if printed is None:
-        printed = set()
-    
-    if revision in tree:
-        children = sorted(tree[revision], key=lambda x: x[0])
-        for i, (child_rev, description) in enumerate(children):
-            if child_rev in printed:
-                continue
-            printed.add(child_rev)
-            
-            is_last_child = (i == len(children) - 1)
+    # Stack entries: (revision, line to print, prefix for its children, depth)
+    stack: List[Tuple[Optional[str], str, str, int]] = [(root, "", "", -1)]
+    
+    while stack:
+        revision, line, prefix, depth = stack.pop()
+        if depth >= 0:
+            print(line)
+        
+        children = tree.get(revision)
+        if not children:
+            continue
+        last_index = len(children) - 1
+        
+        # Push in reverse so children pop in sorted order
+        for i in range(last_index, -1, -1):
+            child_rev, description = children[i]
+            is_last_child = (i == last_index)
             
             # Determine the connector
-            if indent == 0:
+            if depth < 0:
                 connector = ""
                 new_prefix = ""
             else:
@@ -110,15 +220,14 @@ def print_tree(tree: Dict, revisions: Dict, revision: Optional[str] = None,
                 new_prefix = prefix + ("    " if is_last_child else "│   ")
             
             # Check if this is a head revision
-            is_head = child_rev not in tree or len(tree[child_rev]) == 0
-            head_marker = " [HEAD]" if is_head else ""
-            
-            # Print the revision
-            print(f"{prefix}{connector}{child_rev[:12]} - {description}{head_marker}")
+            head_marker = " [HEAD]" if child_rev in leaves else ""
             
-            # Recursively print children
-            print_tree(tree, revisions, child_rev, indent + 1, printed, 
-                      is_last_child, new_prefix)
+            stack.append((
+                child_rev,
+                f"{prefix}{connector}{child_rev[:12]} - {description}{head_marker}",
+                new_prefix,
+                depth + 1,
+            ))
 
 
 def visualize_branches(tree: Dict, revisions: Dict):
@@ -126,21 +235,19 @@ def visualize_branches(tree: Dict, revisions: Dict):
     Visualize migrations showing any branches or merges.
     """
     # Find all branch points (revisions with multiple children)
-    branch_points = {}
-    for parent, children in tree.items():
-        if len(children) > 1:
-            branch_points[parent] = children
-    
-    if branch_points:
-        print("\n" + "="*60)
-        print("BRANCH POINTS DETECTED:")
-        print("="*60)
-        for parent, children in branch_points.items():
-            parent_desc = revisions[parent][1] if parent and parent in revisions else "Initial"
-            print(f"\nFrom: {parent[:12] if parent else 'None'} ({parent_desc})")
-            print("Branches into:")
-            for child_rev, desc in children:
-                print(f"  → {child_rev[:12]} - {desc}")
+    branch_points = {parent: children for parent, children in tree.items() if len(children) > 1}
+    if not branch_points:
+        return
+    
+    print("\n" + "="*60)
+    print("BRANCH POINTS DETECTED:")
+    print("="*60)
+    for parent, children in branch_points.items():
+        parent_desc = revisions[parent][1] if parent and parent in revisions else "Initial"
+        print(f"\nFrom: {parent[:12] if parent else 'None'} ({parent_desc})")
+        print("Branches into:")
+        for child_rev, desc in children:
+            print(f"  → {child_rev[:12]} - {desc}")
 
 
 def main():
@@ -157,7 +264,7 @@ def main():
     print("ALEMBIC MIGRATION HIERARCHY")
     print("="*60)
     
-    tree, revisions = build_migration_tree(versions_dir)
+    tree, revisions, parents, heads = build_migration_tree(versions_dir)
     
     if not revisions:
         print("No migration files found!")
@@ -165,7 +272,6 @@ def main():
     
     # Print statistics
     print(f"\nTotal migrations: {len(revisions)}")
-    heads = find_heads(tree, revisions)
     print(f"Head revision(s): {len(heads)}")
     if heads:
         for head in heads:
@@ -178,15 +284,14 @@ def main():
     # Start from None (root) to show all migrations
     if None in tree:
         print("[Initial Migration]")
-        print_tree(tree, revisions, None)
+        print_tree(tree, revisions, heads, None)
     else:
         # If there's no None root, find the actual root(s)
-        all_down_revisions = set(rev[0] for rev in revisions.values() if rev[0])
-        roots = set(revisions.keys()) - all_down_revisions
+        roots = set(revisions) - parents
         
         for root in roots:
             print(f"{root[:12]} - {revisions[root][1]} [ROOT]")
-            print_tree(tree, revisions, root)
+            print_tree(tree, revisions, heads, root)
     
     # Check for branches
     visualize_branches(tree, revisions)
@@ -197,23 +302,25 @@ def main():
     print("="*60)
     
     # Check for orphaned migrations
-    all_parents = set()
-    for rev, (down_rev, _) in revisions.items():
-        if down_rev:
-            all_parents.add(down_rev)
-    
-    orphaned = all_parents - set(revisions.keys()) - {None}
+    orphaned = parents - set(revisions)
     if orphaned:
         print("\n⚠️  WARNING: References to non-existent revisions:")
         for orph in orphaned:
             print(f"  - {orph}")
     
+    # Check for dependency cycles
+    cycles = find_cycles(tree, revisions)
+    if cycles:
+        print("\n⚠️  WARNING: Cycles detected in the migration graph!")
+        for cycle in cycles:
+            print(f"  - {' → '.join(rev[:12] for rev in cycle)} → {cycle[0][:12]}")
+    
     # Check for multiple heads
     if len(heads) > 1:
         print("\n⚠️  WARNING: Multiple heads detected!")
         print("This might indicate parallel branches that need to be merged.")
     
-    if not orphaned and len(heads) == 1:
+    if not orphaned and not cycles and len(heads) == 1:
         print("\n✅ Migration hierarchy looks healthy!")
 
 
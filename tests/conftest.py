@@ -1,44 +1,100 @@
+import asyncio
+import os
 import pytest
 import pytest_asyncio
-import asyncio
-from typing import AsyncGenerator, Generator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import sessionmaker
+from pytest_asyncio import is_async_test
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import selectinload
 from sqlalchemy.pool import StaticPool
 from app.models.base import Base
-from app.core.config import settings
 from app.db.base import get_db
 from app.models.user import User
-from app.models.tournament import Tournament
+from app.models.tournament import Tournament, TournamentStatus, TournamentSystem, tournament_player
 from app.models.round import Round
-import uuid
+from itertools import count
+from types import SimpleNamespace
 from datetime import date
-from fastapi.testclient import TestClient
-import httpx
 from httpx import AsyncClient, ASGITransport
 from app.main import app
 
 
+# Ids only need to be unique within a test run; avoid OS entropy reads
+_uid = count()
+
+
+def _fake_uuid() -> str:
+    """Return a unique 32-char hex id for test fixtures."""
+    return f"{next(_uid):032x}"
+
+
 @pytest.fixture(scope="session")
-def event_loop() -> Generator:
-    """Create an instance of the default event loop for the test session."""
-    policy = asyncio.get_event_loop_policy()
-    loop = policy.new_event_loop()
-    yield loop
-    loop.close()
+def make_id():
+    """Return a factory of unique row ids for tests that create their own rows."""
+    return _fake_uuid
 
 
-@pytest_asyncio.fixture(scope="function")
+def pytest_collection_modifyitems(items):
+    """Run every async test in the session event loop shared with test_engine."""
+    session_scope_marker = pytest.mark.asyncio(scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_scope_marker, append=False)
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run async tests on uvloop only when TEST_UVLOOP=1 opts in; the default asyncio loop otherwise."""
+    if os.getenv("TEST_UVLOOP") != "1":
+        return asyncio.DefaultEventLoopPolicy()
+    import uvloop  # opt-in, so a missing install should fail loudly
+    return uvloop.EventLoopPolicy()
+
+
+@pytest_asyncio.fixture(scope="session")
 async def test_engine():
-    """Create test database engine."""
-    # Use in-memory SQLite for tests with proper settings
-    test_database_url = "sqlite+aiosqlite:///:memory:"
-    engine = create_async_engine(
-        test_database_url,
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-        echo=False
-    )
+    """Create test database engine once per test session."""
+    # In-memory SQLite by default: commits never touch disk. TEST_DB_URL overrides it.
+    test_database_url = make_url(os.getenv("TEST_DB_URL", "sqlite+aiosqlite:///:memory:"))
+    
+    # Give each pytest-xdist worker its own database; in-memory SQLite already is per process
+    # and file SQLite creates the suffixed file on connect
+    admin_engine = None
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    if worker and test_database_url.database and test_database_url.database != ":memory:":
+        worker_database = f"{test_database_url.database}_{worker}"
+        if test_database_url.get_backend_name() != "sqlite":
+            # Server backends: create the worker database from a connection to the
+            # configured one; CREATE/DROP DATABASE cannot run inside a transaction
+            admin_engine = create_async_engine(test_database_url, isolation_level="AUTOCOMMIT")
+            quoted_database = admin_engine.dialect.identifier_preparer.quote(worker_database)
+            async with admin_engine.connect() as conn:
+                await conn.exec_driver_sql(f"DROP DATABASE IF EXISTS {quoted_database}")
+                await conn.exec_driver_sql(f"CREATE DATABASE {quoted_database}")
+        test_database_url = test_database_url.set(database=worker_database)
+    
+    if test_database_url.get_backend_name() != "sqlite":
+        engine = create_async_engine(test_database_url, echo=False)
+    else:
+        # StaticPool keeps the single in-memory database alive across checkouts
+        engine = create_async_engine(
+            test_database_url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+            echo=False
+        )
+        
+        # pysqlite's own transaction handling breaks SAVEPOINT; emit BEGIN ourselves
+        @event.listens_for(engine.sync_engine, "connect")
+        def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+        
+        @event.listens_for(engine.sync_engine, "begin")
+        def _emit_begin(conn):
+            conn.exec_driver_sql("BEGIN")
     
     # Create all tables
     async with engine.begin() as conn:
@@ -48,37 +104,154 @@ async def test_engine():
     
     # Clean up
     await engine.dispose()
+    if admin_engine is not None:
+        async with admin_engine.connect() as conn:
+            await conn.exec_driver_sql(f"DROP DATABASE IF EXISTS {quoted_database}")
+        await admin_engine.dispose()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def test_connection(test_engine):
+    """Hold a single connection with an open outer transaction for the whole session."""
+    async with test_engine.connect() as connection:
+        await connection.begin()
+        yield connection
+        await connection.rollback()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def seeded_db(test_connection) -> Dict[str, Any]:
+    """
+    Insert the shared organizer, players and tournament once per session.
+    
+    Rows live in the outer transaction, so per-test savepoint rollbacks undo any
+    changes tests make to them. Returns the seeded ids.
+    """
+    organizer_id = _fake_uuid()
+    player_ids = [_fake_uuid() for _ in range(8)]  # 8 players for Americano
+    tournament_id = _fake_uuid()
+    
+    await test_connection.execute(insert(User), [
+        {
+            "id": organizer_id,
+            "email": "organizer@example.com",
+            "full_name": "Tournament Organizer",
+            "is_active": True,
+            "is_verified": True
+        },
+        *(
+            {
+                "id": player_id,
+                "email": f"player{i+1}@example.com",
+                "full_name": f"Player {i+1}",
+                "is_active": True,
+                "is_verified": True
+            }
+            for i, player_id in enumerate(player_ids)
+        ),
+    ])
+    await test_connection.execute(insert(Tournament).values(
+        id=tournament_id,
+        name="Shared Test Tournament",
+        description="A test tournament",
+        location="Test Location",
+        start_date=date(2024, 12, 1),
+        entry_fee=50.0,
+        max_players=8,
+        system=TournamentSystem.AMERICANO,
+        points_per_match=32,
+        courts=2,
+        created_by=organizer_id,
+        status="pending"
+    ))
+    await test_connection.execute(insert(tournament_player), [
+        {"tournament_id": tournament_id, "player_id": player_id} for player_id in player_ids
+    ])
+    
+    return {"organizer_id": organizer_id, "player_ids": player_ids, "tournament_id": tournament_id}
 
 
 @pytest_asyncio.fixture
-async def db_session(test_engine):
-    """Create a database session for testing."""
-    async_session_maker = async_sessionmaker(
-        test_engine,
-        class_=AsyncSession,
+async def db_session(test_connection, seeded_db):
+    """
+    Create a database session for testing.
+    
+    The session is joined to a savepoint on the shared connection that is rolled
+    back after each test, so commits inside tests only release inner savepoints.
+    """
+    savepoint = await test_connection.begin_nested()
+    session = AsyncSession(
+        bind=test_connection,
         expire_on_commit=False,
-        autocommit=False,
-        autoflush=False
+        autoflush=False,
+        join_transaction_mode="create_savepoint"
     )
     
-    async with async_session_maker() as session:
+    try:
         yield session
-        await session.rollback()
+    finally:
+        await session.close()
+        await savepoint.rollback()
+
+
+@pytest_asyncio.fixture
+async def active_tournament_with_match(
+    db_session: AsyncSession, test_tournament: Tournament, test_players: list[SimpleNamespace], request
+):
+    """
+    Activate the test tournament at round 1 and add a single round-1 match.
+    
+    The match is pending by default; pass Round column overrides with
+    @pytest.mark.parametrize("active_tournament_with_match", [{...}], indirect=True).
+    Returns (tournament, match).
+    """
+    # ORM-enabled UPDATE: one statement, and synchronize_session keeps test_tournament current
+    await db_session.execute(
+        update(Tournament)
+        .where(Tournament.id == test_tournament.id)
+        .values(status=TournamentStatus.ACTIVE.value, current_round=1)
+    )
+    
+    match_values = {
+        "id": _fake_uuid(),
+        "tournament_id": test_tournament.id,
+        "round_number": 1,
+        "team1_player1_id": test_players[0].id,
+        "team1_player2_id": test_players[1].id,
+        "team2_player1_id": test_players[2].id,
+        "team2_player2_id": test_players[3].id,
+        "is_completed": False,
+        **getattr(request, "param", {}),
+    }
+    result = await db_session.execute(insert(Round).values(**match_values).returning(Round))
+    match = result.scalar_one()
+    # One commit for both the status change and the match
+    await db_session.commit()
+    
+    return test_tournament, match
+
+
+# Session used by the get_db override; swapped in per test by override_get_db
+_current_db_session: Dict[str, AsyncSession] = {}
+
+
+def _get_current_db_session() -> AsyncSession:
+    return _current_db_session["session"]
 
 
 @pytest.fixture
 def override_get_db(db_session):
     """Override the get_db dependency for testing."""
-    def _override_get_db():
-        return db_session
-    return _override_get_db
+    _current_db_session["session"] = db_session
+    yield _get_current_db_session
+    _current_db_session.pop("session", None)
 
 
 @pytest_asyncio.fixture
 async def test_user(db_session: AsyncSession) -> User:
     """Create a test user."""
     user = User(
-        id=str(uuid.uuid4()),
+        id=_fake_uuid(),
         email="test@example.com",
         full_name="Test User",
         is_active=True,
@@ -86,87 +259,53 @@ async def test_user(db_session: AsyncSession) -> User:
     )
     db_session.add(user)
     await db_session.commit()
-    await db_session.refresh(user)
     return user
 
 
 @pytest_asyncio.fixture
-async def test_organizer(db_session: AsyncSession) -> User:
-    """Create a test tournament organizer."""
-    organizer = User(
-        id=str(uuid.uuid4()),
-        email="organizer@example.com",
-        full_name="Tournament Organizer",
-        is_active=True,
-        is_verified=True
-    )
-    db_session.add(organizer)
-    await db_session.commit()
-    await db_session.refresh(organizer)
-    return organizer
+async def test_organizer(db_session: AsyncSession, seeded_db) -> User:
+    """Return the seeded tournament organizer."""
+    return await db_session.get(User, seeded_db["organizer_id"])
 
 
-@pytest_asyncio.fixture
-async def test_players(db_session: AsyncSession) -> list[User]:
-    """Create test players for tournaments."""
-    players = []
-    for i in range(8):  # Create 8 players for Americano
-        player = User(
-            id=str(uuid.uuid4()),
-            email=f"player{i+1}@example.com",
-            full_name=f"Player {i+1}",
-            is_active=True,
-            is_verified=True
-        )
-        db_session.add(player)
-        players.append(player)
-    
-    await db_session.commit()
-    for player in players:
-        await db_session.refresh(player)
+@pytest.fixture
+def test_players(seeded_db, request) -> list[SimpleNamespace]:
+    """
+    Return lightweight stand-ins for the seeded test players.
     
-    return players
+    Tests only read player attributes, so no rows are loaded. Defaults to all
+    8 players; request fewer with
+    @pytest.mark.parametrize("test_players", [n], indirect=True).
+    """
+    num_players = getattr(request, "param", 8)
+    return [
+        SimpleNamespace(id=player_id, email=f"player{i+1}@example.com", full_name=f"Player {i+1}")
+        for i, player_id in enumerate(seeded_db["player_ids"][:num_players])
+    ]
 
 
 @pytest_asyncio.fixture
-async def test_tournament(db_session: AsyncSession, test_organizer: User, test_players: list[User]) -> Tournament:
-    """Create a test tournament with players."""
-    tournament = Tournament(
-        id=str(uuid.uuid4()),
-        name="Test Tournament",
-        description="A test tournament",
-        location="Test Location",
-        start_date=date(2024, 12, 1),
-        entry_fee=50.0,
-        max_players=8,
-        system="AMERICANO",
-        points_per_match=32,
-        courts=2,
-        created_by=test_organizer.id,
-        status="pending"
+async def test_tournament(db_session: AsyncSession, seeded_db) -> Tournament:
+    """Return the seeded test tournament with its players eager-loaded."""
+    result = await db_session.execute(
+        select(Tournament)
+        .options(selectinload(Tournament.players))
+        .where(Tournament.id == seeded_db["tournament_id"])
     )
-    
-    # Add players to tournament
-    tournament.players = test_players
-    
-    db_session.add(tournament)
-    await db_session.commit()
-    await db_session.refresh(tournament)
-    
-    return tournament
+    return result.scalar_one()
 
 
-@pytest.fixture
-def test_app(override_get_db):
-    """Create test FastAPI app with overridden dependencies."""
-    app.dependency_overrides[get_db] = override_get_db
+@pytest.fixture(scope="session")
+def test_app():
+    """Create test FastAPI app with the get_db override installed once per session."""
+    app.dependency_overrides[get_db] = _get_current_db_session
     yield app
     app.dependency_overrides.clear()
 
 
-@pytest_asyncio.fixture
-async def async_client(test_app):
-    """Create async HTTP client for testing."""
+@pytest_asyncio.fixture(scope="session")
+async def _session_client(test_app):
+    """Create one async HTTP client shared by the whole test session."""
     async with AsyncClient(
         transport=ASGITransport(app=test_app),
         base_url="http://test"
@@ -174,33 +313,76 @@ async def async_client(test_app):
         yield client
 
 
+@pytest_asyncio.fixture
+async def async_client(_session_client, override_get_db):
+    """Yield the shared HTTP client bound to this test's database session."""
+    yield _session_client
+
+
+@pytest.fixture(autouse=True)
+def _reset_overrides(test_app):
+    """Restore the app's dependency overrides after every test so none leak."""
+    saved = dict(test_app.dependency_overrides)
+    yield
+    test_app.dependency_overrides.clear()
+    test_app.dependency_overrides.update(saved)
+
+
 @pytest.fixture
-def americano_tournament_factory(mocker):
+def override(test_app):
+    """Return a helper that makes a dependency resolve to a fixed value for one test."""
+    def _override(dependency, value):
+        test_app.dependency_overrides[dependency] = lambda: value
+    return _override
+
+
+@dataclass(slots=True)
+class _FakePlayer:
+    """Lightweight stand-in for User in format-service unit tests."""
+    id: str
+    full_name: str
+    email: str
+
+
+@dataclass(slots=True)
+class _FakeTournament:
+    """Lightweight stand-in for Tournament in format-service unit tests."""
+    id: str
+    system: TournamentSystem
+    points_per_match: int
+    courts: int
+    max_players: int
+    players: List[_FakePlayer] = field(default_factory=list)
+
+
+@pytest.fixture(scope="module")
+def americano_tournament_factory():
     """
-    Shared factory fixture for creating Americano tournaments with mock data.
+    Shared factory fixture for creating Americano tournaments with fake data.
     This replaces duplicate fixtures across test files.
+    Tests only read the returned objects, so results are cached per argument set
+    and shared across the module.
     """
+    _cache: Dict[Tuple[int, Optional[int], int], Tuple[_FakeTournament, List[_FakePlayer]]] = {}
+
     def _create(num_players, courts=None, points_per_match=32):
-        from app.models.tournament import Tournament, TournamentSystem
-        from app.models.user import User
-        
-        tournament = mocker.Mock(spec=Tournament)
-        tournament.id = str(uuid.uuid4())
-        tournament.system = TournamentSystem.AMERICANO
-        tournament.points_per_match = points_per_match
-        tournament.courts = courts or max(1, num_players // 8)
-        tournament.max_players = num_players
-        
-        # Create mock players with consistent IDs
-        players = []
-        for i in range(num_players):
-            player = mocker.Mock(spec=User)
-            player.id = f"P{i}"  # Short, consistent IDs
-            player.full_name = f"Player {i+1}"
-            player.email = f"player{i+1}@test.com"
-            players.append(player)
-        
-        tournament.players = players
+        key = (num_players, courts, points_per_match)
+        if key in _cache:
+            return _cache[key]
+        # Create players with consistent IDs
+        players = [
+            _FakePlayer(id=f"P{i}", full_name=f"Player {i+1}", email=f"player{i+1}@test.com")
+            for i in range(num_players)
+        ]
+        tournament = _FakeTournament(
+            id=_fake_uuid(),
+            system=TournamentSystem.AMERICANO,
+            points_per_match=points_per_match,
+            courts=courts or max(1, num_players // 8),
+            max_players=num_players,
+            players=players,
+        )
+        _cache[key] = (tournament, players)
         return tournament, players
     
-    return _create
\ No newline at end of file
+    return _create
@@ -4,17 +4,19 @@ from sqlalchemy import select
 from app.models.user import User
 from app.models.tournament import Tournament, TournamentStatus
 from app.models.round import Round
+from app.repositories.round_repository import RoundRepository
 from app.repositories.tournament_repository import TournamentRepository
+from app.services.americano_service import AmericanoTournamentService
 from app.services.tournament_service import TournamentService
-import uuid
 from datetime import date
+from types import SimpleNamespace
 
 
 @pytest.mark.asyncio
-async def test_user_creation(db_session: AsyncSession):
+async def test_user_creation(db_session: AsyncSession, make_id):
     """Test creating a user in the database."""
     user = User(
-        id=str(uuid.uuid4()),
+        id=make_id(),
         email="test@example.com",
         full_name="Test User",
         is_active=True,
@@ -35,10 +37,10 @@ async def test_user_creation(db_session: AsyncSession):
 
 
 @pytest.mark.asyncio
-async def test_tournament_creation(db_session: AsyncSession, test_organizer: User):
+async def test_tournament_creation(db_session: AsyncSession, test_organizer: User, make_id):
     """Test creating a tournament in the database."""
     tournament = Tournament(
-        id=str(uuid.uuid4()),
+        id=make_id(),
         name="Test Tournament",
         description="A test tournament",
         location="Test Location",
@@ -66,7 +68,7 @@ async def test_tournament_creation(db_session: AsyncSession, test_organizer: Use
 
 
 @pytest.mark.asyncio
-async def test_tournament_player_relationship(db_session: AsyncSession, test_tournament: Tournament, test_players: list[User]):
+async def test_tournament_player_relationship(db_session: AsyncSession, test_tournament: Tournament, test_players: list[SimpleNamespace]):
     """Test many-to-many relationship between tournaments and players."""
     # test_tournament already has players from the fixture
     # Verify relationship by querying
@@ -85,12 +87,13 @@ async def test_tournament_player_relationship(db_session: AsyncSession, test_tou
 
 
 @pytest.mark.asyncio
-async def test_round_creation(db_session: AsyncSession, test_tournament: Tournament, test_players: list[User]):
+@pytest.mark.parametrize("test_players", [4], indirect=True)
+async def test_round_creation(db_session: AsyncSession, test_tournament: Tournament, test_players: list[SimpleNamespace], make_id):
     """Test creating rounds in the database."""
     players = test_players[:4]  # Get first 4 players
     
     round_match = Round(
-        id=str(uuid.uuid4()),
+        id=make_id(),
         tournament_id=test_tournament.id,
         round_number=1,
         team1_player1_id=players[0].id,
@@ -119,13 +122,51 @@ async def test_round_creation(db_session: AsyncSession, test_tournament: Tournam
 
 
 @pytest.mark.asyncio
-async def test_tournament_repository_operations(db_session: AsyncSession, test_organizer: User):
+async def test_sql_player_statistics_match_format_service(
+    db_session: AsyncSession, test_tournament: Tournament, test_players: list[SimpleNamespace], make_id
+):
+    """SQL-aggregated player statistics agree with the Americano format service."""
+    ids = [player.id for player in test_players]
+    # (team1, team2, team1_score, team2_score, is_completed): wins, a tie and an unplayed match
+    matches = [
+        ((0, 1), (2, 3), 20, 12, True),
+        ((4, 5), (6, 7), 16, 16, True),
+        ((0, 2), (1, 3), 10, 22, True),
+        ((4, 6), (5, 7), 17, 15, True),
+        ((0, 3), (1, 2), None, None, False),
+    ]
+    rounds = [
+        Round(
+            id=make_id(),
+            tournament_id=test_tournament.id,
+            round_number=i + 1,
+            team1_player1_id=ids[t1[0]],
+            team1_player2_id=ids[t1[1]],
+            team2_player1_id=ids[t2[0]],
+            team2_player2_id=ids[t2[1]],
+            team1_score=score1,
+            team2_score=score2,
+            is_completed=completed,
+        )
+        for i, (t1, t2, score1, score2, completed) in enumerate(matches)
+    ]
+    db_session.add_all(rounds)
+    await db_session.commit()
+    
+    sql_stats = await RoundRepository(db_session).get_player_statistics(test_tournament.id)
+    format_stats = AmericanoTournamentService(test_tournament, test_players).calculate_player_statistics(rounds)
+    
+    assert sql_stats == format_stats
+
+
+@pytest.mark.asyncio
+async def test_tournament_repository_operations(db_session: AsyncSession, test_organizer: User, make_id):
     """Test tournament repository operations."""
     repo = TournamentRepository(db_session)
     
     # Create tournament data
     tournament_data = {
-        "id": str(uuid.uuid4()),
+        "id": make_id(),
         "name": "Repository Test Tournament",
         "description": "Testing repository",
         "location": "Test Location",
@@ -202,16 +243,18 @@ async def test_complex_tournament_flow(db_session: AsyncSession, test_tournament
     assert len(leaderboard) > 0
     assert all("player_name" in entry for entry in leaderboard)
     assert all("score" in entry for entry in leaderboard)
+    # SQL-aggregated leaderboard scores agree with format service scores
+    assert {entry["player_id"]: entry["score"] for entry in leaderboard} == scores
 
 
 @pytest.mark.asyncio
-async def test_database_transaction_rollback(db_session: AsyncSession):
+async def test_database_transaction_rollback(db_session: AsyncSession, make_id):
     """Test database transaction rollback on error."""
     # This test verifies that database transactions are properly rolled back
     # when an error occurs, maintaining data integrity
     
     user = User(
-        id=str(uuid.uuid4()),
+        id=make_id(),
         email="rollback_test@example.com",
         full_name="Rollback Test User",
         is_active=True,
@@ -6,15 +6,14 @@ from app.models.tournament import Tournament
 from app.models.round import Round
 from app.services.tournament_service import TournamentService
 from app.services.americano_service import AmericanoTournamentService
-import uuid
 
 
 @pytest.mark.asyncio
-async def test_basic_flow():
+async def test_basic_flow(make_id):
     """Test basic flow without database."""
     # Create mock tournament
     tournament = Tournament(
-        id=str(uuid.uuid4()),
+        id=make_id(),
         system="AMERICANO",
         points_per_match=32,
         courts=2,
@@ -27,7 +26,7 @@ async def test_basic_flow():
     players = []
     for i in range(8):
         player = User(
-            id=str(uuid.uuid4()),
+            id=make_id(),
             full_name=f"Player {i+1}",
             email=f"player{i+1}@example.com"
         )
@@ -46,7 +45,7 @@ async def test_basic_flow():
     # Test statistics calculation
     completed_rounds = []
     round1 = Round(
-        id=str(uuid.uuid4()),
+        id=make_id(),
         tournament_id=tournament.id,
         round_number=1,
         team1_player1_id=players[0].id,
@@ -71,11 +70,11 @@ async def test_basic_flow():
 
 
 @pytest.mark.asyncio 
-async def test_leaderboard_format():
+async def test_leaderboard_format(make_id):
     """Test leaderboard data format."""
     # Create tournament with completed matches
     tournament = Tournament(
-        id=str(uuid.uuid4()),
+        id=make_id(),
         system="AMERICANO",
         points_per_match=32,
         courts=2,
@@ -87,7 +86,7 @@ async def test_leaderboard_format():
     players = []
     for i in range(4):
         player = User(
-            id=str(uuid.uuid4()),
+            id=make_id(),
             full_name=f"Player {i+1}",
             email=f"player{i+1}@example.com"
         )
@@ -99,7 +98,7 @@ async def test_leaderboard_format():
     # Create match data
     completed_rounds = [
         Round(
-            id=str(uuid.uuid4()),
+            id=make_id(),
             tournament_id=tournament.id,
             round_number=1,
             team1_player1_id=players[0].id,
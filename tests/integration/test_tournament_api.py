@@ -1,31 +1,44 @@
 import pytest
-from app.models.tournament import TournamentStatus
 from app.models.user import User
-from app.models.tournament import Tournament
-from app.models.round import Round
+from app.models.tournament import Tournament, tournament_player
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-import uuid
+from sqlalchemy import insert, select
+from datetime import date
+from types import SimpleNamespace
+from app.core.dependencies import get_current_user, get_tournament_as_organizer, get_tournament_for_user
+
+
+# Invariant request payload and row values shared by the tests below
+TOURNAMENT_CREATE_PAYLOAD = {
+    "name": "Test Tournament",
+    "description": "A test tournament",
+    "location": "Test Location",
+    "start_date": "2024-12-01",
+    "entry_fee": 50.0,
+    "max_players": 8,
+    "system": "AMERICANO",
+    "points_per_match": 32,
+    "courts": 2
+}
+
+BASE_TOURNAMENT = dict(
+    location="Test Location",
+    start_date=date(2024, 12, 1),
+    entry_fee=50.0,
+    system="AMERICANO",
+    points_per_match=32,
+    courts=2,
+    status="pending"
+)
 
 
 @pytest.mark.asyncio
-async def test_create_tournament(async_client, db_session: AsyncSession, test_organizer: User):
+async def test_create_tournament(async_client, override, db_session: AsyncSession, test_organizer: User):
     """Test tournament creation."""
-    tournament_data = {
-        "name": "Test Tournament",
-        "description": "A test tournament",
-        "location": "Test Location",
-        "start_date": "2024-12-01",
-        "entry_fee": 50.0,
-        "max_players": 8,
-        "system": "AMERICANO",
-        "points_per_match": 32,
-        "courts": 2
-    }
+    tournament_data = TOURNAMENT_CREATE_PAYLOAD
     
     # Mock authentication
-    from app.core.dependencies import get_current_user
-    async_client._transport.app.dependency_overrides[get_current_user] = lambda: test_organizer
+    override(get_current_user, test_organizer)
     
     response = await async_client.post("/api/v1/tournaments/", json=tournament_data)
     
@@ -37,12 +50,11 @@ async def test_create_tournament(async_client, db_session: AsyncSession, test_or
 
 
 @pytest.mark.asyncio
-async def test_start_tournament(async_client, db_session: AsyncSession, test_tournament: Tournament, test_organizer: User):
+async def test_start_tournament(async_client, override, db_session: AsyncSession, test_tournament: Tournament, test_organizer: User):
     """Test starting a tournament."""
     # Mock authentication and tournament access
-    from app.core.dependencies import get_current_user, get_tournament_as_organizer
-    async_client._transport.app.dependency_overrides[get_current_user] = lambda: test_organizer
-    async_client._transport.app.dependency_overrides[get_tournament_as_organizer] = lambda: test_tournament
+    override(get_current_user, test_organizer)
+    override(get_tournament_as_organizer, test_tournament)
     
     response = await async_client.post(f"/api/v1/tournaments/{test_tournament.id}/start")
     
@@ -54,33 +66,20 @@ async def test_start_tournament(async_client, db_session: AsyncSession, test_tou
 
 
 @pytest.mark.asyncio
-async def test_get_tournament_leaderboard(async_client, db_session: AsyncSession, test_tournament: Tournament, test_organizer: User, test_players: list[User]):
+@pytest.mark.parametrize("test_players", [4], indirect=True)
+@pytest.mark.parametrize(
+    "active_tournament_with_match",
+    [{"team1_score": 17, "team2_score": 15, "is_completed": True}],
+    indirect=True
+)
+async def test_get_tournament_leaderboard(async_client, override, active_tournament_with_match, test_organizer: User):
     """Test getting tournament leaderboard."""
-    # Set tournament to active status
-    test_tournament.status = TournamentStatus.ACTIVE.value
-    await db_session.commit()
-    
-    # Create some completed matches
-    match = Round(
-        id=str(uuid.uuid4()),
-        tournament_id=test_tournament.id,
-        round_number=1,
-        team1_player1_id=test_players[0].id,
-        team1_player2_id=test_players[1].id,
-        team2_player1_id=test_players[2].id,
-        team2_player2_id=test_players[3].id,
-        team1_score=17,
-        team2_score=15,
-        is_completed=True
-    )
-    db_session.add(match)
-    await db_session.commit()
+    tournament, _ = active_tournament_with_match
     
     # Mock authentication
-    from app.core.dependencies import get_current_user
-    async_client._transport.app.dependency_overrides[get_current_user] = lambda: test_organizer
+    override(get_current_user, test_organizer)
     
-    response = await async_client.get(f"/api/v1/tournaments/{test_tournament.id}/leaderboard")
+    response = await async_client.get(f"/api/v1/tournaments/{tournament.id}/leaderboard")
     
     assert response.status_code == 200
     data = response.json()
@@ -96,30 +95,13 @@ async def test_get_tournament_leaderboard(async_client, db_session: AsyncSession
 
 
 @pytest.mark.asyncio
-async def test_record_match_result(async_client, db_session: AsyncSession, test_tournament: Tournament, test_organizer: User, test_players: list[User]):
+@pytest.mark.parametrize("test_players", [4], indirect=True)
+async def test_record_match_result(async_client, override, active_tournament_with_match, test_organizer: User):
     """Test recording match result."""
-    # Set tournament to active status
-    test_tournament.status = TournamentStatus.ACTIVE.value
-    test_tournament.current_round = 1
-    await db_session.commit()
-    
-    # Create a match
-    match = Round(
-        id=str(uuid.uuid4()),
-        tournament_id=test_tournament.id,
-        round_number=1,
-        team1_player1_id=test_players[0].id,
-        team1_player2_id=test_players[1].id,
-        team2_player1_id=test_players[2].id,
-        team2_player2_id=test_players[3].id,
-        is_completed=False
-    )
-    db_session.add(match)
-    await db_session.commit()
+    _, match = active_tournament_with_match
     
     # Mock authentication
-    from app.core.dependencies import get_current_user
-    async_client._transport.app.dependency_overrides[get_current_user] = lambda: test_organizer
+    override(get_current_user, test_organizer)
     
     result_data = {
         "team1_score": 17,
@@ -135,32 +117,15 @@ async def test_record_match_result(async_client, db_session: AsyncSession, test_
 
 
 @pytest.mark.asyncio
-async def test_get_current_round_matches(async_client, db_session: AsyncSession, test_tournament: Tournament, test_organizer: User, test_players: list[User]):
+@pytest.mark.parametrize("test_players", [4], indirect=True)
+async def test_get_current_round_matches(async_client, override, active_tournament_with_match, test_organizer: User):
     """Test getting current round matches."""
-    # Set tournament to active status
-    test_tournament.status = TournamentStatus.ACTIVE.value
-    test_tournament.current_round = 1
-    await db_session.commit()
-    
-    # Create matches for current round
-    match = Round(
-        id=str(uuid.uuid4()),
-        tournament_id=test_tournament.id,
-        round_number=1,
-        team1_player1_id=test_players[0].id,
-        team1_player2_id=test_players[1].id,
-        team2_player1_id=test_players[2].id,
-        team2_player2_id=test_players[3].id,
-        is_completed=False
-    )
-    db_session.add(match)
-    await db_session.commit()
+    tournament, _ = active_tournament_with_match
     
     # Mock authentication
-    from app.core.dependencies import get_current_user
-    async_client._transport.app.dependency_overrides[get_current_user] = lambda: test_organizer
+    override(get_current_user, test_organizer)
     
-    response = await async_client.get(f"/api/v1/tournaments/{test_tournament.id}/matches/current")
+    response = await async_client.get(f"/api/v1/tournaments/{tournament.id}/matches/current")
     
     assert response.status_code == 200
     data = response.json()
@@ -171,33 +136,25 @@ async def test_get_current_round_matches(async_client, db_session: AsyncSession,
 
 
 @pytest.mark.asyncio
-async def test_join_tournament(async_client, db_session: AsyncSession, test_user: User, test_organizer: User):
+async def test_join_tournament(async_client, override, db_session: AsyncSession, test_user: User, test_organizer: User, make_id):
     """Test joining a tournament."""
     # Create a new tournament specifically for this test with space for more players
-    from datetime import date
-    tournament = Tournament(
-        id=str(uuid.uuid4()),
-        name="Join Test Tournament",
-        description="A test tournament for joining",
-        location="Test Location",
-        start_date=date(2024, 12, 1),
-        entry_fee=50.0,
-        max_players=16,  # More space for joining
-        system="AMERICANO",
-        points_per_match=32,
-        courts=2,
-        created_by=test_organizer.id,
-        status="pending"
+    result = await db_session.execute(
+        insert(Tournament).values(
+            id=make_id(),
+            name="Join Test Tournament",
+            description="A test tournament for joining",
+            max_players=16,  # More space for joining
+            created_by=test_organizer.id,
+            **BASE_TOURNAMENT
+        ).returning(Tournament)
     )
-    
-    db_session.add(tournament)
+    tournament = result.scalar_one()
     await db_session.commit()
-    await db_session.refresh(tournament)
     
     # Mock authentication and tournament access
-    from app.core.dependencies import get_current_user, get_tournament_for_user
-    async_client._transport.app.dependency_overrides[get_current_user] = lambda: test_user
-    async_client._transport.app.dependency_overrides[get_tournament_for_user] = lambda: tournament
+    override(get_current_user, test_user)
+    override(get_tournament_for_user, tournament)
     
     response = await async_client.post(f"/api/v1/tournaments/{tournament.id}/join")
     
@@ -207,36 +164,31 @@ async def test_join_tournament(async_client, db_session: AsyncSession, test_user
 
 
 @pytest.mark.asyncio
-async def test_leave_tournament(async_client, db_session: AsyncSession, test_organizer: User, test_players: list[User]):
+@pytest.mark.parametrize("test_players", [1], indirect=True)
+async def test_leave_tournament(async_client, override, db_session: AsyncSession, test_organizer: User, test_players: list[SimpleNamespace], make_id):
     """Test leaving a tournament."""
     # Create a tournament with the user already in it
-    from datetime import date
-    tournament = Tournament(
-        id=str(uuid.uuid4()),
-        name="Leave Test Tournament",
-        description="A test tournament for leaving",
-        location="Test Location",
-        start_date=date(2024, 12, 1),
-        entry_fee=50.0,
-        max_players=16,
-        system="AMERICANO",
-        points_per_match=32,
-        courts=2,
-        created_by=test_organizer.id,
-        status="pending"
+    result = await db_session.execute(
+        insert(Tournament).values(
+            id=make_id(),
+            name="Leave Test Tournament",
+            description="A test tournament for leaving",
+            max_players=16,
+            created_by=test_organizer.id,
+            **BASE_TOURNAMENT
+        ).returning(Tournament)
     )
+    tournament = result.scalar_one()
     
     # Add the first player to the tournament
-    tournament.players = [test_players[0]]
-    
-    db_session.add(tournament)
+    await db_session.execute(
+        tournament_player.insert().values(tournament_id=tournament.id, player_id=test_players[0].id)
+    )
     await db_session.commit()
-    await db_session.refresh(tournament)
     
     # Mock authentication and tournament access
-    from app.core.dependencies import get_current_user, get_tournament_for_user
-    async_client._transport.app.dependency_overrides[get_current_user] = lambda: test_players[0]
-    async_client._transport.app.dependency_overrides[get_tournament_for_user] = lambda: tournament
+    override(get_current_user, test_players[0])
+    override(get_tournament_for_user, tournament)
     
     response = await async_client.post(f"/api/v1/tournaments/{tournament.id}/leave")
     
@@ -1,11 +1,39 @@
 import pytest
-from app.services.americano_service import AmericanoTournamentService
-from app.models.round import Round
-from collections import defaultdict
+from app.services import americano_service
+from app.services.americano_service import AmericanoTournamentService, _generate_rounds_cached
+from dataclasses import dataclass
 from math import comb
 import time
 
 
+@dataclass(slots=True)
+class _FakeRound:
+    """Plain stand-in for a completed Round used in score calculations."""
+    team1_player1_id: str
+    team1_player2_id: str
+    team2_player1_id: str
+    team2_player2_id: str
+    team1_score: int
+    team2_score: int
+    is_completed: bool = True
+
+
+def _pair_key(a: int, b: int) -> int:
+    """Pack an unordered pair of player ordinals into a single int."""
+    return (a << 16) | b if a < b else (b << 16) | a
+
+
+def _partnership_keys(rounds, players) -> set:
+    """Set of packed partnership keys over all matches in the schedule."""
+    ordinal = {p.id: i for i, p in enumerate(players)}
+    partnerships = set()
+    for round_matches in rounds:
+        for a, b, c, d in round_matches:
+            partnerships.add(_pair_key(ordinal[a], ordinal[b]))
+            partnerships.add(_pair_key(ordinal[c], ordinal[d]))
+    return partnerships
+
+
 class TestAmericanoTournament:
     """
     Comprehensive test suite for Americano tournament algorithm.
@@ -44,34 +72,24 @@ class TestAmericanoTournament:
             tournament, players = americano_tournament_factory(num_players)
             service = AmericanoTournamentService(tournament)
             
-            rounds = service.generate_rounds()
-            
-            # Track all partnerships
-            partnerships_seen = set()
-            repeated_partnerships = []
+            rounds = service.generate_round_ordinals()
             
-            for round_idx, round_matches in enumerate(rounds):
-                for match_idx, match in enumerate(round_matches):
-                    # Extract partnerships from match
-                    team1 = tuple(sorted([match[0], match[1]]))
-                    team2 = tuple(sorted([match[2], match[3]]))
-                    
-                    # Check for repeats
-                    if team1 in partnerships_seen:
-                        repeated_partnerships.append(f"Partnership {team1} repeated in R{round_idx+1}M{match_idx+1}")
-                    if team2 in partnerships_seen:
-                        repeated_partnerships.append(f"Partnership {team2} repeated in R{round_idx+1}M{match_idx+1}")
-                    
-                    partnerships_seen.add(team1)
-                    partnerships_seen.add(team2)
+            # Every partnership as a packed ordinal pair, in schedule order
+            keys = [
+                key
+                for round_matches in rounds
+                for a, b, c, d in round_matches
+                for key in (_pair_key(a, b), _pair_key(c, d))
+            ]
+            unique_keys = set(keys)
             
-            assert len(repeated_partnerships) == 0, \
-                f"Found repeated partnerships for {num_players} players: {repeated_partnerships}"
+            assert len(keys) == len(unique_keys), \
+                f"Found {len(keys) - len(unique_keys)} repeated partnerships for {num_players} players"
             
             # Verify we use exactly C(n,2) partnerships
             expected_partnerships = comb(num_players, 2)
-            assert len(partnerships_seen) == expected_partnerships, \
-                f"Expected {expected_partnerships} partnerships, got {len(partnerships_seen)}"
+            assert len(unique_keys) == expected_partnerships, \
+                f"Expected {expected_partnerships} partnerships, got {len(unique_keys)}"
 
     def test_complete_partnership_coverage(self, americano_tournament_factory):
         """Test that every player partners with every other player exactly once."""
@@ -79,28 +97,25 @@ class TestAmericanoTournament:
             tournament, players = americano_tournament_factory(num_players)
             service = AmericanoTournamentService(tournament)
             
-            rounds = service.generate_rounds()
+            rounds = service.generate_round_ordinals()
             
-            # Track partnerships for each player
-            player_partners = defaultdict(set)
+            # Adjacency rows as bitmasks: bit j of partners[i] means i partnered j
+            partners = [0] * num_players
             
             for round_matches in rounds:
-                for match in round_matches:
-                    team1_p1, team1_p2, team2_p1, team2_p2 = match
-                    
-                    # Record partnerships
-                    player_partners[team1_p1].add(team1_p2)
-                    player_partners[team1_p2].add(team1_p1)
-                    player_partners[team2_p1].add(team2_p2)
-                    player_partners[team2_p2].add(team2_p1)
+                for a, b, c, d in round_matches:
+                    partners[a] |= 1 << b
+                    partners[b] |= 1 << a
+                    partners[c] |= 1 << d
+                    partners[d] |= 1 << c
             
             # Verify completeness
-            for player_id in [p.id for p in players]:
-                expected_partners = num_players - 1
-                actual_partners = len(player_partners[player_id])
+            expected_partners = num_players - 1
+            for player, mask in zip(players, partners):
+                actual_partners = mask.bit_count()
                 
                 assert actual_partners == expected_partners, \
-                    f"Player {player_id} partnered with {actual_partners}/{expected_partners} others"
+                    f"Player {player.id} partnered with {actual_partners}/{expected_partners} others"
 
     def test_complete_opposition_coverage(self, americano_tournament_factory):
         """Test that every player faces every other player at least once."""
@@ -108,28 +123,27 @@ class TestAmericanoTournament:
             tournament, players = americano_tournament_factory(num_players)
             service = AmericanoTournamentService(tournament)
             
-            rounds = service.generate_rounds()
+            rounds = service.generate_round_ordinals()
             
-            # Track opponents for each player
-            player_opponents = defaultdict(set)
+            # Adjacency rows as bitmasks: bit j of opponents[i] means i faced j
+            opponents = [0] * num_players
             
             for round_matches in rounds:
-                for match in round_matches:
-                    team1_p1, team1_p2, team2_p1, team2_p2 = match
-                    
-                    # Record oppositions
-                    for t1_player in [team1_p1, team1_p2]:
-                        for t2_player in [team2_p1, team2_p2]:
-                            player_opponents[t1_player].add(t2_player)
-                            player_opponents[t2_player].add(t1_player)
+                for a, b, c, d in round_matches:
+                    team2_mask = (1 << c) | (1 << d)
+                    team1_mask = (1 << a) | (1 << b)
+                    opponents[a] |= team2_mask
+                    opponents[b] |= team2_mask
+                    opponents[c] |= team1_mask
+                    opponents[d] |= team1_mask
             
             # Verify completeness
-            for player_id in [p.id for p in players]:
-                expected_opponents = num_players - 1
-                actual_opponents = len(player_opponents[player_id])
+            expected_opponents = num_players - 1
+            for player, mask in zip(players, opponents):
+                actual_opponents = mask.bit_count()
                 
                 assert actual_opponents == expected_opponents, \
-                    f"Player {player_id} faced {actual_opponents}/{expected_opponents} opponents"
+                    f"Player {player.id} faced {actual_opponents}/{expected_opponents} opponents"
 
     def test_tournament_structure_properties(self, americano_tournament_factory):
         """Test mathematical properties of tournament structure."""
@@ -167,6 +181,17 @@ class TestAmericanoTournament:
                 assert len(round_matches) == expected_matches_per_round, \
                     f"Round {round_idx+1} has {len(round_matches)} matches, expected {expected_matches_per_round}"
 
+    def test_round_ordinals_match_player_ids(self, americano_tournament_factory):
+        """The ordinal schedule is the id schedule indexed into the player list."""
+        tournament, players = americano_tournament_factory(8)
+        service = AmericanoTournamentService(tournament)
+        
+        mapped = [
+            [tuple(players[i].id for i in match) for match in round_matches]
+            for round_matches in service.generate_round_ordinals()
+        ]
+        assert mapped == service.generate_rounds()
+
     def test_one_factorization_algorithm(self, americano_tournament_factory):
         """Test the underlying 1-factorization algorithm."""
         for n in [4, 8, 12, 16]:
@@ -201,59 +226,40 @@ class TestAmericanoTournament:
         pairings = AmericanoTournamentService._pairings_of_edges(edges)
         assert len(pairings) == 3
 
+    def test_lazy_pairing_patterns_match_memoized(self, monkeypatch):
+        """Sizes above the memoization cap are generated lazily, in the same order."""
+        memoized = list(americano_service._iter_pairing_patterns(8))
+        monkeypatch.setattr(americano_service, "_MAX_MEMOIZED_PATTERN_SIZE", 2)
+        assert list(americano_service._iter_pairing_patterns(8)) == memoized
+        assert len(memoized) == 105  # 7!!
+
     def test_algorithm_determinism(self, americano_tournament_factory):
         """Test that algorithm produces consistent results."""
-        tournament, players = americano_tournament_factory(8)
+        tournament, _ = americano_tournament_factory(8)
         service = AmericanoTournamentService(tournament)
         
-        # Generate multiple times
+        # Generate multiple times, recomputing the schedule instead of reading the memoized one
         results = []
         for _ in range(3):
-            rounds = service.generate_rounds()
-            
-            # Convert to comparable format
-            partnerships = set()
-            for round_matches in rounds:
-                for match in round_matches:
-                    partnerships.add(tuple(sorted([match[0], match[1]])))
-                    partnerships.add(tuple(sorted([match[2], match[3]])))
-            
-            results.append(partnerships)
+            _generate_rounds_cached.cache_clear()
+            results.append(service.generate_rounds())
         
         # All results should be identical
         first_result = results[0]
         for i, result in enumerate(results[1:], 1):
             assert result == first_result, f"Run {i+1} differs from run 1"
 
-    def test_score_calculation(self, americano_tournament_factory, mocker):
+    def test_score_calculation(self, americano_tournament_factory):
         """Test player score calculations."""
         tournament, players = americano_tournament_factory(4)
         service = AmericanoTournamentService(tournament)
         
-        # Create mock rounds with specific scores
-        rounds = []
-        
-        # Round 1: P0,P1 vs P2,P3 -> 20-12
-        round1 = mocker.Mock(spec=Round)
-        round1.is_completed = True
-        round1.team1_player1_id = "P0"
-        round1.team1_player2_id = "P1"
-        round1.team2_player1_id = "P2"
-        round1.team2_player2_id = "P3"
-        round1.team1_score = 20
-        round1.team2_score = 12
-        rounds.append(round1)
-        
-        # Round 2: P0,P2 vs P1,P3 -> 16-16
-        round2 = mocker.Mock(spec=Round)
-        round2.is_completed = True
-        round2.team1_player1_id = "P0"
-        round2.team1_player2_id = "P2"
-        round2.team2_player1_id = "P1"
-        round2.team2_player2_id = "P3"
-        round2.team1_score = 16
-        round2.team2_score = 16
-        rounds.append(round2)
+        rounds = [
+            # Round 1: P0,P1 vs P2,P3 -> 20-12
+            _FakeRound("P0", "P1", "P2", "P3", team1_score=20, team2_score=12),
+            # Round 2: P0,P2 vs P1,P3 -> 16-16
+            _FakeRound("P0", "P2", "P1", "P3", team1_score=16, team2_score=16),
+        ]
         
         scores = service.calculate_player_scores(rounds)
         
@@ -279,36 +285,48 @@ class TestAmericanoTournament:
         assert rounds == 7
         assert duration > 0
 
-    def test_performance_scalability(self, americano_tournament_factory):
+    # Cold timings with every pattern cache cleared are about 0.05, 0.3, 1.1, 2.7,
+    # 9 and 125 ms; the ceilings keep well over an order of magnitude of headroom
+    # for slow or coverage-instrumented CI while still rising with n like the
+    # (n/2 - 1)!! pairing search does
+    @pytest.mark.parametrize("num_players,ceiling_ms", [
+        (4, 50),
+        (8, 50),
+        (12, 100),
+        (16, 250),
+        (20, 1_000),
+        (24, 5_000),
+    ])
+    def test_performance_scalability(self, americano_tournament_factory, num_players, ceiling_ms):
         """Test algorithm performance for different tournament sizes."""
-        performance_data = []
+        tournament, players = americano_tournament_factory(num_players)
+        service = AmericanoTournamentService(tournament)
         
-        for num_players in [4, 8, 12, 16, 20, 24]:
-            tournament, players = americano_tournament_factory(num_players)
-            service = AmericanoTournamentService(tournament)
-            
-            start = time.time()
+        # Time the actual search from a cold start: drop the cached schedule and
+        # the memoized pairing patterns before each run; best of three so a
+        # single scheduler hiccup does not fail the run
+        timings_ns = []
+        for _ in range(3):
+            _generate_rounds_cached.cache_clear()
+            americano_service._pairing_index_patterns.cache_clear()
+            americano_service._flat_pairing_patterns.cache_clear()
+            start = time.perf_counter_ns()
             rounds = service.generate_rounds()
-            duration = time.time() - start
-            
-            performance_data.append((num_players, duration))
-            
-            # Verify correctness
-            assert len(rounds) == num_players - 1
-            
-            # Count partnerships
-            partnerships = set()
-            for round_matches in rounds:
-                for match in round_matches:
-                    partnerships.add(tuple(sorted([match[0], match[1]])))
-                    partnerships.add(tuple(sorted([match[2], match[3]])))
-            
-            expected = comb(num_players, 2)
-            assert len(partnerships) == expected
+            timings_ns.append(time.perf_counter_ns() - start)
+        duration_ns = min(timings_ns)
+        
+        # Verify correctness
+        assert len(rounds) == num_players - 1
+        
+        # Count partnerships
+        partnerships = _partnership_keys(rounds, players)
+        
+        expected = comb(num_players, 2)
+        assert len(partnerships) == expected
         
         # Performance should be reasonable
-        for num_players, duration in performance_data:
-            assert duration < 5.0, f"{num_players} players took {duration:.3f}s - too slow"
+        assert duration_ns < ceiling_ms * 1_000_000, \
+            f"{num_players} players took {duration_ns / 1e6:.1f}ms - over the {ceiling_ms}ms ceiling"
 
     @pytest.mark.parametrize("num_players,expected_rounds,expected_partnerships", [
         (4, 3, 6),     # C(4,2) = 6
@@ -328,11 +346,7 @@ class TestAmericanoTournament:
         assert len(rounds) == expected_rounds
         
         # Count partnerships
-        partnerships = set()
-        for round_matches in rounds:
-            for match in round_matches:
-                partnerships.add(tuple(sorted([match[0], match[1]])))
-                partnerships.add(tuple(sorted([match[2], match[3]])))
+        partnerships = _partnership_keys(rounds, players)
         
         assert len(partnerships) == expected_partnerships
 
@@ -358,4 +372,8 @@ class TestAmericanoTournament:
         # Test leaderboard
         leaderboard = service.get_player_leaderboard(player_scores)
         expected = [("P1", 120), ("P0", 100), ("P2", 90), ("P3", 85)]
-        assert leaderboard == expected
\ No newline at end of file
+        assert leaderboard == expected
+        
+        # Test top-k leaderboard
+        assert service.get_player_leaderboard(player_scores, k=2) == expected[:2]
+        assert service.get_player_leaderboard(player_scores, k=10) == expected
\ No newline at end of file
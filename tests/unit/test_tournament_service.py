@@ -1,13 +1,81 @@
 import pytest
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Optional
 from unittest.mock import Mock, AsyncMock
 from app.services.tournament_service import TournamentService
 from app.services.americano_service import AmericanoTournamentService
-from app.models.tournament import Tournament, TournamentSystem, TournamentStatus
-from app.models.user import User
+from app.models.tournament import TournamentSystem, TournamentStatus
 from app.models.round import Round
 import uuid
 
 
+# Deterministic ids built once at import: no urandom reads, reproducible failures
+_UUID_POOL = [str(uuid.uuid5(uuid.NAMESPACE_URL, f"padeppoints-test-{i}")) for i in range(16)]
+_PLAYER_IDS = _UUID_POOL[:8]
+_TOURNAMENT_ID = _UUID_POOL[8]
+_MATCH_ID = _UUID_POOL[9]
+
+# Scores of the first four players after two 17-15 wins for team 1
+_SCORE_PATTERN = (34, 34, 30, 30)
+
+# Enum members and values bound once instead of looked up in every test
+_AMERICANO = TournamentSystem.AMERICANO
+_PENDING = TournamentStatus.PENDING.value
+_ACTIVE = TournamentStatus.ACTIVE.value
+_COMPLETED = TournamentStatus.COMPLETED.value
+
+# Aggregated stats rows for the first three players, built once; the repository only reads them
+_LEADERBOARD_STATS_ROWS = [
+    {'player_id': player_id, 'points_earned': earned, 'points_conceded': conceded,
+     'wins': wins, 'losses': losses, 'ties': ties, 'matches_played': 4}
+    for player_id, (earned, conceded, wins, losses, ties) in zip(_PLAYER_IDS, [
+        (100, 85, 3, 1, 0),
+        (90, 85, 2, 1, 1),
+        (80, 90, 1, 2, 1),
+    ])
+]
+
+
+@dataclass(slots=True, frozen=True)
+class _FakeUser:
+    """Plain stand-in for User; tests only read these attributes."""
+    id: str
+    full_name: str
+    email: str
+
+
+@dataclass(slots=True, eq=False, repr=False)
+class _FakeRound:
+    """Plain stand-in for Round; skips the ORM spec introspection of Mock(spec=Round)."""
+    id: str = ""
+    tournament_id: str = ""
+    is_completed: bool = False
+    team1_score: Optional[int] = None
+    team2_score: Optional[int] = None
+    team1_player1_id: str = ""
+    team1_player2_id: str = ""
+    team2_player1_id: str = ""
+    team2_player2_id: str = ""
+
+
+def _scalar_result(value):
+    """Query result whose scalar_one_or_none() returns value."""
+    return Mock(scalar_one_or_none=Mock(return_value=value))
+
+
+def _player_ids_result(players):
+    """Query result whose scalars().all() returns the ids of players."""
+    return Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=[p.id for p in players]))))
+
+
+def _stub_scalar_results(service, *values):
+    """Return one scalar_one_or_none result per value from service.db.execute, in call order."""
+    results = [_scalar_result(value) for value in values]
+    service.db.execute.side_effect = results
+    return results
+
+
 class TestTournamentService:
     """Test cases for TournamentService."""
 
@@ -23,41 +91,36 @@ class TestTournamentService:
 
     @pytest.fixture
     def mock_tournament(self):
-        """Create mock tournament."""
-        tournament = Mock(spec=Tournament)
-        tournament.id = str(uuid.uuid4())
-        tournament.name = "Test Tournament"
-        tournament.system = TournamentSystem.AMERICANO
-        tournament.status = TournamentStatus.PENDING.value
-        tournament.current_round = 1
-        tournament.points_per_match = 32
-        tournament.courts = 2
-        tournament.max_players = 8
-        return tournament
+        """Create a plain tournament stub; tests only read and assign attributes."""
+        return SimpleNamespace(
+            id=_TOURNAMENT_ID,
+            name="Test Tournament",
+            system=_AMERICANO,
+            status=_PENDING,
+            current_round=1,
+            points_per_match=32,
+            courts=2,
+            max_players=8,
+        )
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_players(self):
-        """Create mock players."""
-        players = []
-        for i in range(8):
-            player = Mock(spec=User)
-            player.id = str(uuid.uuid4())
-            player.full_name = f"Player {i+1}"
-            player.email = f"player{i+1}@example.com"
-            players.append(player)
-        return players
+        """Create mock players once per module; a tuple of frozen stubs, so mutation fails fast."""
+        return tuple(
+            _FakeUser(id=player_id, full_name=f"Player {i+1}", email=f"player{i+1}@example.com")
+            for i, player_id in enumerate(_PLAYER_IDS)
+        )
 
     def test_get_format_service_americano(self, tournament_service, mock_tournament, mock_players):
         """Test getting Americano format service."""
-        mock_tournament.system = TournamentSystem.AMERICANO
+        mock_tournament.system = _AMERICANO
         mock_tournament.players = mock_players
         service = tournament_service.get_format_service(mock_tournament)
         assert isinstance(service, AmericanoTournamentService)
 
     def test_get_format_service_unsupported(self, tournament_service):
         """Test getting unsupported format service raises error."""
-        mock_tournament = Mock()
-        mock_tournament.system = "UNSUPPORTED"
+        mock_tournament = SimpleNamespace(system="UNSUPPORTED")
         
         with pytest.raises(ValueError, match="Unsupported tournament system"):
             tournament_service.get_format_service(mock_tournament)
@@ -65,16 +128,11 @@ class TestTournamentService:
     @pytest.mark.asyncio
     async def test_start_tournament_success(self, tournament_service, mock_tournament, mock_players):
         """Test successful tournament start."""
-        # Setup mock
-        mock_tournament.players = mock_players
-        tournament_service.db.execute = AsyncMock()
-        tournament_service.db.commit = AsyncMock()
-        tournament_service.db.refresh = AsyncMock()
-        
-        # Mock database query result
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = mock_tournament
-        tournament_service.db.execute.return_value = mock_result
+        # Mock database query results: tournament, then its player ids, then the insert;
+        # the stub has no players attribute, so touching the relationship would fail
+        tournament_service.db.execute.side_effect = [
+            _scalar_result(mock_tournament), _player_ids_result(mock_players), Mock(),
+        ]
         
         # Mock format service
         mock_format_service = Mock()
@@ -87,16 +145,33 @@ class TestTournamentService:
         
         result = await tournament_service.start_tournament(mock_tournament.id)
         
-        assert result.status == TournamentStatus.ACTIVE.value
+        assert result.status == _ACTIVE
         assert result.current_round == 1
         tournament_service.db.commit.assert_called_once()
+        
+        # The format service gets id-only players from the association table query
+        _, players = tournament_service.get_format_service.call_args.args
+        assert [player.id for player in players] == _PLAYER_IDS
+        
+        # All rounds are written by one bulk insert, one row per match
+        statement, rows = tournament_service.db.execute.await_args.args
+        assert statement.is_insert and statement.table.name == Round.__tablename__
+        assert rows == [
+            {
+                "tournament_id": mock_tournament.id,
+                "round_number": round_number,
+                "team1_player1_id": mock_players[first].id,
+                "team1_player2_id": mock_players[first + 1].id,
+                "team2_player1_id": mock_players[first + 2].id,
+                "team2_player2_id": mock_players[first + 3].id,
+            }
+            for round_number, first in ((1, 0), (2, 4))
+        ]
 
     @pytest.mark.asyncio
     async def test_start_tournament_not_found(self, tournament_service):
         """Test starting non-existent tournament."""
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = None
-        tournament_service.db.execute = AsyncMock(return_value=mock_result)
+        _stub_scalar_results(tournament_service, None)
         
         with pytest.raises(ValueError, match="Tournament .* not found"):
             await tournament_service.start_tournament("nonexistent-id")
@@ -104,11 +179,9 @@ class TestTournamentService:
     @pytest.mark.asyncio
     async def test_start_tournament_wrong_status(self, tournament_service, mock_tournament):
         """Test starting tournament with wrong status."""
-        mock_tournament.status = TournamentStatus.ACTIVE.value
+        mock_tournament.status = _ACTIVE
         
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = mock_tournament
-        tournament_service.db.execute = AsyncMock(return_value=mock_result)
+        _stub_scalar_results(tournament_service, mock_tournament)
         
         with pytest.raises(ValueError, match="Tournament .* cannot be started"):
             await tournament_service.start_tournament(mock_tournament.id)
@@ -117,23 +190,10 @@ class TestTournamentService:
     async def test_record_match_result_success(self, tournament_service, mock_tournament):
         """Test recording match result successfully."""
         # Setup mock match
-        mock_match = Mock(spec=Round)
-        mock_match.id = str(uuid.uuid4())
-        mock_match.tournament_id = mock_tournament.id
-        mock_match.is_completed = False
-        mock_match.team1_score = None
-        mock_match.team2_score = None
+        mock_match = _FakeRound(id=_MATCH_ID, tournament_id=mock_tournament.id)
         
         # Setup mock database responses
-        match_result = Mock()
-        match_result.scalar_one_or_none.return_value = mock_match
-        
-        tournament_result = Mock()
-        tournament_result.scalar_one_or_none.return_value = mock_tournament
-        
-        tournament_service.db.execute = AsyncMock(side_effect=[match_result, tournament_result])
-        tournament_service.db.commit = AsyncMock()
-        tournament_service.db.refresh = AsyncMock()
+        _stub_scalar_results(tournament_service, mock_match, mock_tournament)
         tournament_service._check_and_advance_round = AsyncMock()
         
         result = await tournament_service.record_match_result(mock_match.id, 17, 15)
@@ -143,29 +203,29 @@ class TestTournamentService:
         assert result.is_completed == True
         tournament_service.db.commit.assert_called_once()
 
+    @pytest.fixture(scope="module")
+    def unplayed_match(self):
+        """Match that stays unplayed: the validation cases reject it before any write."""
+        return _FakeRound(id=_MATCH_ID, tournament_id=_TOURNAMENT_ID)
+
     @pytest.mark.asyncio
-    async def test_record_match_result_invalid_scores(self, tournament_service, mock_tournament):
-        """Test recording match result with invalid scores."""
-        mock_match = Mock(spec=Round)
-        mock_match.id = str(uuid.uuid4())
-        mock_match.tournament_id = mock_tournament.id
-        mock_match.is_completed = False
-        
-        match_result = Mock()
-        match_result.scalar_one_or_none.return_value = mock_match
-        
-        tournament_result = Mock()
-        tournament_result.scalar_one_or_none.return_value = mock_tournament
-        
-        # Test negative scores - need fresh mock for each test
-        tournament_service.db.execute = AsyncMock(side_effect=[match_result, tournament_result])
-        with pytest.raises(ValueError, match="Scores must be non-negative"):
-            await tournament_service.record_match_result(mock_match.id, -1, 15)
-        
-        # Test invalid Americano scores (don't sum to points_per_match) - reset mock side_effect
-        tournament_service.db.execute = AsyncMock(side_effect=[match_result, tournament_result])
-        with pytest.raises(ValueError, match="Invalid score for Americano format"):
-            await tournament_service.record_match_result(mock_match.id, 10, 15)
+    @pytest.mark.parametrize("team1_score,team2_score,status,error", [
+        (-1, 15, _PENDING, "Scores must be non-negative"),
+        (15, -1, _PENDING, "Scores must be non-negative"),
+        # Americano scores must sum to points_per_match
+        (10, 15, _PENDING, "Invalid score for Americano format"),
+        (17, 15, _COMPLETED, "Cannot edit results"),
+    ])
+    async def test_record_match_result_invalid_scores(
+        self, tournament_service, mock_tournament, unplayed_match, team1_score, team2_score, status, error
+    ):
+        """Test that record_match_result rejects invalid scores and completed tournaments."""
+        mock_tournament.status = status
+        
+        _stub_scalar_results(tournament_service, unplayed_match, mock_tournament)
+        with pytest.raises(ValueError, match=error):
+            await tournament_service.record_match_result(unplayed_match.id, team1_score, team2_score)
+        assert not unplayed_match.is_completed
 
     @pytest.mark.asyncio
     async def test_get_player_scores(self, tournament_service, mock_tournament, mock_players):
@@ -174,30 +234,30 @@ class TestTournamentService:
         mock_tournament.players = mock_players
         
         # Setup mock completed rounds
-        mock_rounds = []
-        for i in range(2):
-            round_match = Mock(spec=Round)
-            round_match.is_completed = True
-            round_match.team1_player1_id = mock_players[0].id
-            round_match.team1_player2_id = mock_players[1].id
-            round_match.team2_player1_id = mock_players[2].id
-            round_match.team2_player2_id = mock_players[3].id
-            round_match.team1_score = 17
-            round_match.team2_score = 15
-            mock_rounds.append(round_match)
+        mock_rounds = [
+            _FakeRound(
+                is_completed=True,
+                team1_score=17,
+                team2_score=15,
+                team1_player1_id=mock_players[0].id,
+                team1_player2_id=mock_players[1].id,
+                team2_player1_id=mock_players[2].id,
+                team2_player2_id=mock_players[3].id,
+            )
+            for _ in range(2)
+        ]
         
         # Setup database mocks
-        tournament_result = Mock()
-        tournament_result.scalar_one_or_none.return_value = mock_tournament
+        tournament_result = _scalar_result(mock_tournament)
         
         rounds_result = Mock()
         rounds_result.scalars.return_value.all.return_value = mock_rounds
         
-        tournament_service.db.execute = AsyncMock(side_effect=[tournament_result, rounds_result])
+        tournament_service.db.execute.side_effect = [tournament_result, rounds_result]
         
         # Mock format service
         mock_format_service = Mock()
-        expected_scores = {player.id: 34 if i < 2 else 30 for i, player in enumerate(mock_players[:4])}
+        expected_scores = dict(zip(_PLAYER_IDS, _SCORE_PATTERN))
         mock_format_service.calculate_player_scores.return_value = expected_scores
         tournament_service.get_format_service = Mock(return_value=mock_format_service)
         
@@ -211,54 +271,21 @@ class TestTournamentService:
         # Setup mock tournament with players
         mock_tournament.players = mock_players
         
-        # Setup mock tournament and rounds query results
-        tournament_result = Mock()
-        tournament_result.scalar_one_or_none.return_value = mock_tournament
-        
-        # Mock completed rounds
-        rounds_result = Mock()
-        rounds_result.scalars.return_value.all.return_value = []
+        # Setup mock tournament query result
+        tournament_result = _scalar_result(mock_tournament)
         
-        # Mock users query
-        users_result = Mock()
-        users_result.scalars.return_value.all.return_value = mock_players[:3]
+        # Mock per-player statistics aggregated in the database
+        stats_result = Mock()
+        stats_result.mappings.return_value = _LEADERBOARD_STATS_ROWS
         
-        tournament_service.db.execute = AsyncMock(side_effect=[tournament_result, rounds_result, users_result])
-        
-        # Mock format service with comprehensive statistics
-        mock_format_service = Mock()
-        mock_player_stats = {
-            mock_players[0].id: {
-                'total_points': 100,
-                'points_difference': 15,
-                'wins': 3,
-                'losses': 1,
-                'ties': 0,
-                'matches_played': 4
-            },
-            mock_players[1].id: {
-                'total_points': 90,
-                'points_difference': 5,
-                'wins': 2,
-                'losses': 1,
-                'ties': 1,
-                'matches_played': 4
-            },
-            mock_players[2].id: {
-                'total_points': 80,
-                'points_difference': -10,
-                'wins': 1,
-                'losses': 2,
-                'ties': 1,
-                'matches_played': 4
-            }
-        }
-        mock_format_service.calculate_player_statistics.return_value = mock_player_stats
-        tournament_service.get_format_service = Mock(return_value=mock_format_service)
+        tournament_service.db.execute.side_effect = [tournament_result, stats_result]
         
         leaderboard = await tournament_service.get_tournament_leaderboard(mock_tournament.id)
         
-        assert len(leaderboard) == 3
+        # Players without completed matches are listed with zero statistics
+        assert len(leaderboard) == len(mock_players)
+        assert all(entry["score"] == 0 and entry["matches_played"] == 0 for entry in leaderboard[3:])
+        
         # Check first place (highest total points)
         assert leaderboard[0]["player_name"] == "Player 1"
         assert leaderboard[0]["score"] == 100
@@ -278,4 +305,46 @@ class TestTournamentService:
         assert leaderboard[2]["player_name"] == "Player 3"
         assert leaderboard[2]["score"] == 80
         assert leaderboard[2]["points_difference"] == -10
-        assert leaderboard[2]["rank"] == 3
\ No newline at end of file
+        assert leaderboard[2]["rank"] == 3
+
+    @pytest.mark.asyncio
+    async def test_check_and_advance_round(self, tournament_service, mock_tournament, mock_players):
+        """Test round advances only when no incomplete matches remain."""
+        mock_tournament.status = _ACTIVE
+        
+        # Player ids are only queried once the round is complete
+        tournament_service.db.execute.side_effect = [
+            _scalar_result(mock_tournament), _scalar_result(mock_tournament), _player_ids_result(mock_players),
+        ]
+        
+        # Incomplete matches remain - stay on the current round
+        tournament_service.db.scalar.return_value = True
+        await tournament_service._check_and_advance_round(mock_tournament.id)
+        assert mock_tournament.current_round == 1
+        tournament_service.db.commit.assert_not_called()
+        
+        # All matches completed - advance to the next round
+        tournament_service.db.scalar.return_value = False
+        await tournament_service._check_and_advance_round(mock_tournament.id)
+        assert mock_tournament.current_round == 2
+        tournament_service.db.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_get_tournament_winner_from_stored_results(self, tournament_service, mock_tournament, mock_players):
+        """Test winner of a completed tournament is read from stored final results."""
+        mock_tournament.status = _COMPLETED
+        mock_tournament.players = mock_players
+        
+        winner_result = SimpleNamespace(total_score=120)
+        stored_result = Mock()
+        stored_result.first.return_value = (winner_result, mock_players[1])
+        tournament_service.db.execute.return_value = stored_result
+        tournament_service.get_format_service = Mock()
+        
+        winner = await tournament_service.get_tournament_winner(mock_tournament.id, mock_tournament)
+        
+        assert winner["player_id"] == mock_players[1].id
+        assert winner["player_name"] == "Player 2"
+        assert winner["score"] == 120
+        assert tournament_service.db.execute.call_count == 1
+        tournament_service.get_format_service.assert_not_called()